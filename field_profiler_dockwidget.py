@@ -1,26 +1,29 @@
 # -*- coding: utf-8 -*-
 
 import os
-import csv
+import functools
 import re
 import string
+import time
+from math import isnan as _isnan
 from qgis.PyQt import QtWidgets, QtCore, QtGui
 from qgis.PyQt.QtCore import QVariant, Qt, QDate, QDateTime, QTime
 from qgis.PyQt.QtWidgets import (QWidget, QVBoxLayout, QGroupBox, QLabel, QCheckBox,
-                                 QListWidget, QPushButton, QDockWidget, QTableWidget,
+                                 QListWidget, QListWidgetItem, QPushButton, QDockWidget, QTableWidget, QTableView,
                                  QAbstractItemView, QTableWidgetItem, QApplication,
                                  QFileDialog, QHBoxLayout, QSizePolicy, QProgressBar,
                                  QSpinBox, QFormLayout, QPlainTextEdit, QHeaderView, QDialog, QComboBox)
 from qgis.gui import QgsMapLayerComboBox
 from qgis.core import (QgsProject, QgsVectorLayer, QgsField, Qgis,
                        QgsStatisticalSummary, QgsMapLayerProxyModel, QgsFeatureRequest,
-                       QgsExpression, QgsTask, QgsApplication, QgsMessageLog)
+                       QgsExpression, QgsExpressionContext, QgsExpressionContextUtils,
+                       QgsTask, QgsApplication, QgsMessageLog, QgsVectorLayerFeatureSource)
 
 import statistics
 from collections import Counter, OrderedDict
 import numpy # Keep this import
 from datetime import datetime
-from .field_profiler_task import FieldProfilerTask
+from .field_profiler_task import FieldProfilerTask, CsvExportTask
 from .report_generator import ReportGenerator
 
 
@@ -31,25 +34,35 @@ try:
 except ImportError:
     scipy_stats = None # So we can check against it
 
-MATPLOTLIB_AVAILABLE = False
-try:
-    import matplotlib
-    matplotlib.use('Qt5Agg') # Or QtAgg depending on environment, try safe default or check
-    from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-    from matplotlib.figure import Figure
-    import matplotlib.pyplot as plt
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
+# Matplotlib is imported on first use of the Charts tab (it is slow to import and
+# memory-hungry); None means "not tried yet".
+MATPLOTLIB_AVAILABLE = None
+Figure = None
+FigureCanvas = None
+
+def _load_matplotlib():
+    """Import matplotlib's Qt canvas once; returns whether charts are available."""
+    global MATPLOTLIB_AVAILABLE, Figure, FigureCanvas
+    if MATPLOTLIB_AVAILABLE is not None:
+        return MATPLOTLIB_AVAILABLE
+    MATPLOTLIB_AVAILABLE = False
     try:
-         # Try QtAgg for newer matplotlib/PyQt6 if Qt5Agg fails
         import matplotlib
-        matplotlib.use('QtAgg')
-        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+        matplotlib.use('Qt5Agg') # Or QtAgg depending on environment, try safe default or check
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
         from matplotlib.figure import Figure
-        import matplotlib.pyplot as plt
         MATPLOTLIB_AVAILABLE = True
     except ImportError:
-        pass
+        try:
+             # Try QtAgg for newer matplotlib/PyQt6 if Qt5Agg fails
+            import matplotlib
+            matplotlib.use('QtAgg')
+            from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+            from matplotlib.figure import Figure
+            MATPLOTLIB_AVAILABLE = True
+        except ImportError:
+            pass
+    return MATPLOTLIB_AVAILABLE
 
 
 STOP_WORDS = set([
@@ -58,10 +71,286 @@ STOP_WORDS = set([
     'will', 'with',
 ])
 
+_QUOTED_VALUE = getattr(QgsExpression, 'quotedValue', None)
+
+# Characters replaced by '_' when a layer name is used as a default file name
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\w\.-]')
+
+# Top-level result keys that hold layer-wide results rather than a field's statistics
+_EXTRA_RESULT_KEYS = ('_global_correlation', '_validation_results')
+
+# Exact types of the numeric values the task produces; a set probe is cheaper per cell
+# than isinstance() against numpy.number's class hierarchy
+_NUMERIC_TYPES = frozenset({int, float, bool,
+                            numpy.float64, numpy.float32, numpy.float16,
+                            numpy.int64, numpy.int32, numpy.int16, numpy.int8,
+                            numpy.uint64, numpy.uint32, numpy.uint16, numpy.uint8})
+_FLOAT_TYPES = frozenset({float, numpy.float64})
+
+
+def _format_float_cell(value, stat_key, fmt, float_fmt):
+    return fmt(value) if value == value else "N/A"
+
+
+def _format_list_cell(value, stat_key, fmt, float_fmt):
+    if stat_key != 'Mode(s)':
+        return "; ".join(map(str, value))
+    formatted_modes = []
+    for v_mode in value:
+        if isinstance(v_mode, (int, float)):
+            try:
+                formatted_modes.append(float_fmt(float(v_mode)))
+            except ValueError:
+                formatted_modes.append(str(v_mode))
+        else:
+            formatted_modes.append(str(v_mode))
+    return ", ".join(formatted_modes)
+
+
+# Display formatters for result cells by exact value type; every other type is shown with str()
+_CELL_FORMATTERS = {float: _format_float_cell, numpy.float64: _format_float_cell, list: _format_list_cell}
+
+
+def _quote_value(value):
+    """
+    Expression literal for a str, QDate or QDateTime value. Uses
+    QgsExpression.quotedValue when this QGIS build provides it.
+    """
+    if _QUOTED_VALUE is not None:
+        return _QUOTED_VALUE(value)
+    if isinstance(value, QDate):
+        return f"date('{value.toString(Qt.ISODate)}')"
+    if isinstance(value, QDateTime):
+        return f"datetime('{value.toString(Qt.ISODate)}')"
+    escaped_val = value.replace("'", "''")
+    return f"'{escaped_val}'"
+
+
+def _number_literal(value):
+    """Expression literal for a numeric value, or None for NaN (which cannot be selected)."""
+    value = float(value)
+    return None if _isnan(value) else str(value)
+
+
+# Literal builders for 'Unique Values (Top)' selections, dispatched on the exact value type
+_UNIQUE_VALUE_LITERALS = {
+    str: _quote_value, QDate: _quote_value, QDateTime: _quote_value,
+    int: _number_literal, float: _number_literal, bool: _number_literal,
+    numpy.float64: _number_literal, numpy.float32: _number_literal,
+    numpy.int64: _number_literal, numpy.int32: _number_literal,
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _stat_label(stat_key, locale_name):
+    """Translated display label for a statistic key; cached per locale."""
+    return QtCore.QCoreApplication.translate("AnalysisResultsDialog", stat_key)
+
+
+def _correlation_cell_styles(matrix):
+    """
+    Per-cell styling for a 2-D float64 correlation matrix, as two arrays of the
+    same shape: the background brush index (0 white for r = 0 and NaN, 1 + i blue
+    for r > 0, 257 + i red for r < 0, with intensity i = int(255 * (1 - |r|))) and
+    a foreground code (0 default, 1 strong positive, 2 strong negative, for |r| > 0.6).
+    """
+    with numpy.errstate(invalid='ignore'):
+        intensity = numpy.clip(255 * (1 - numpy.abs(numpy.nan_to_num(matrix))), 0, 255).astype(numpy.int64)
+        brush_idx = numpy.where(matrix > 0, 1 + intensity, numpy.where(matrix < 0, 257 + intensity, 0))
+        strong = numpy.abs(matrix) > 0.6
+        fg_codes = numpy.where(strong, numpy.where(matrix > 0, 1, 2), 0).astype(numpy.uint8)
+    return brush_idx, fg_codes
+
+
+def _build_correlation_brushes():
+    """
+    Background brushes for correlation cells: index 0 white, 1 + i blue and 257 + i
+    red for every intensity i in 0-255, as picked by _correlation_cell_styles().
+    """
+    return ([QtGui.QBrush(QtGui.QColor(255, 255, 255))]
+            + [QtGui.QBrush(QtGui.QColor(i, i, 255)) for i in range(256)]
+            + [QtGui.QBrush(QtGui.QColor(255, i, i)) for i in range(256)])
+
+
+class ResultsModel(QtCore.QAbstractTableModel):
+    """
+    Read-only model for the results table: a 'Statistic' column followed by one
+    column per analyzed field, one row per statistic. Display text, alignment,
+    tooltips and colors are all computed once in set_results(); data() only
+    looks them up, so the view only pays for the cells it actually paints.
+    """
+    # Shared brushes: every row/cell of a kind returns the same object
+    _BG_QUALITY = QtGui.QBrush(QtGui.QColor(255, 240, 240))
+    _BG_DIST = QtGui.QBrush(QtGui.QColor(240, 240, 255))
+    _BG_DEFAULT = QtGui.QBrush(QtGui.QColor(230, 230, 230))
+    _FG_GRAY = QtGui.QBrush(Qt.gray)
+    _ALIGN_LEFT = int(Qt.AlignVCenter | Qt.AlignLeft)
+    _ALIGN_RIGHT = int(Qt.AlignVCenter | Qt.AlignRight)
+    # Statistic keys containing any of these (case-insensitive) are highlighted as data-quality rows
+    _QUALITY_RE = re.compile("|".join(map(re.escape, ('%', 'Null', 'Empty', 'Error', 'Outlier', 'Spaces', 'Variance', 'Flag', 'Conversion', 'Mismatch', 'Non-Printable'))), re.IGNORECASE)
+    # Statistic keys containing any of these get right-aligned values
+    _ALIGN_RIGHT_RE = re.compile("|".join(map(re.escape, ('%', 'Count', 'Error', 'Outlier', 'Zero', 'Positive', 'Negative', 'Space', 'Empty', 'Value', 'Length', 'Pctl', 'Optimal Bins'))))
+    # Flag statistics whose row is highlighted when the first field's value is this one
+    _QUALITY_FLAG_VALUES = {'Normality (Likely Normal)': False, 'Low Variance Flag': True}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._headers = []
+        self._stat_keys = []   # original (untranslated) statistic key per row
+        self._row_specs = []   # per row: (label, tooltip, background)
+        self._cells = []       # per row: [(text, alignment, tooltip, foreground, sort_key), ...] per field
+        self._order = []       # view row -> row in the lists above (changed by sort())
+        # (background, align right) per statistic key; both depend only on the key, so each is classified once
+        self._row_styles = {}
+
+    def _row_style(self, stat_key):
+        style = self._row_styles.get(stat_key)
+        if style is None:
+            if self._QUALITY_RE.search(stat_key) or stat_key == 'Error':
+                background = self._BG_QUALITY
+            elif stat_key.startswith('%') or "Pctl" in stat_key or stat_key in ['Skewness', 'Kurtosis']:
+                background = self._BG_DIST
+            else:
+                background = self._BG_DEFAULT
+            style = (background, self._ALIGN_RIGHT_RE.search(stat_key) is not None)
+            self._row_styles[stat_key] = style
+        return style
+
+    def set_results(self, stat_keys, field_names, results_data, decimal_places, header_label, translate):
+        self.beginResetModel()
+        self._headers = [header_label] + list(field_names)
+        self._stat_keys = list(stat_keys)
+        self._row_specs = []
+        self._cells = []
+        
+        # Format specs parsed once; the bound format methods are reused for every cell
+        float_fmt = f"{{:.{decimal_places}f}}".format
+        sci_fmt = "{:.4g}".format
+        # printf equivalents of the two specs above, for formatting whole float rows at once
+        float_spec = f"%.{decimal_places}f"
+        sci_spec = "%.4g"
+        align_left, align_right = self._ALIGN_LEFT, self._ALIGN_RIGHT
+        # One results lookup per field, not one per cell
+        field_dicts = [results_data.get(field_name, {}) for field_name in field_names]
+        first_field_data = field_dicts[0] if field_dicts else None
+        
+        for original_stat_key in self._stat_keys:
+            background, row_align_right = self._row_style(original_stat_key)
+            is_sci_row = original_stat_key in ('Normality (Shapiro-Wilk p)', 'Normality (K² p)')
+            fmt = sci_fmt if is_sci_row else float_fmt
+            
+            flag_value = self._QUALITY_FLAG_VALUES.get(original_stat_key)
+            if flag_value is not None and first_field_data is not None and first_field_data.get(original_stat_key) is flag_value:
+                background = self._BG_QUALITY
+            self._row_specs.append((translate(original_stat_key), original_stat_key, background))
+
+            row_values = [field_data.get(original_stat_key, "") for field_data in field_dicts]
+            
+            # Rows holding only floats are formatted in one numpy pass
+            row_texts = None
+            if len(row_values) > 1 and all(type(v) in _FLOAT_TYPES for v in row_values):
+                row_array = numpy.array(row_values, dtype=numpy.float64)
+                row_texts = numpy.char.mod(sci_spec if is_sci_row else float_spec, row_array).tolist()
+                for c in numpy.flatnonzero(numpy.isnan(row_array)).tolist():
+                    row_texts[c] = "N/A"
+            
+            row_cells = []
+            for c, value in enumerate(row_values):
+                value_type = type(value)
+                if row_texts is not None:
+                    display_text = row_texts[c]
+                else:
+                    formatter = _CELL_FORMATTERS.get(value_type)
+                    display_text = formatter(value, original_stat_key, fmt, float_fmt) if formatter else str(value)
+                
+                # Numeric values are right-aligned whatever the row says
+                is_number = value_type in _NUMERIC_TYPES
+                alignment = align_right if row_align_right or is_number else align_left
+                
+                tooltip = None
+                foreground = None
+                if value_type is str and ('\n' in value or len(value) > 60):
+                    tooltip = value
+                elif display_text in ["N/A (Scipy not found)", "N/A (>=3 values needed)", "N/A (<3 valid)"]:
+                    foreground = self._FG_GRAY
+                
+                # Numbers sort numerically (before text), everything else by its text
+                numeric_value = float(value) if is_number and value_type is not bool else None
+                if numeric_value is not None and not _isnan(numeric_value):
+                    sort_key = (0, numeric_value, "")
+                else:
+                    sort_key = (1, 0.0, display_text)
+                row_cells.append((display_text, alignment, tooltip, foreground, sort_key))
+            self._cells.append(row_cells)
+        
+        self._order = list(range(len(self._stat_keys)))
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._order)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(self._headers):
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._order[index.row()]
+        column = index.column()
+        if column == 0:
+            label, tooltip, background = self._row_specs[row]
+            if role == Qt.DisplayRole: return label
+            if role == Qt.UserRole: return self._stat_keys[row]
+            if role == Qt.ToolTipRole: return tooltip
+            if role == Qt.BackgroundRole: return background
+            return None
+        text, alignment, tooltip, foreground, _sort_key = self._cells[row][column - 1]
+        if role == Qt.DisplayRole: return text
+        if role == Qt.TextAlignmentRole: return alignment
+        if role == Qt.ToolTipRole: return tooltip
+        if role == Qt.ForegroundRole: return foreground
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        if column < 0 or column >= len(self._headers):
+            # No sort column: back to the predefined statistic order
+            self._order = list(range(len(self._stat_keys)))
+        elif column == 0:
+            self._order.sort(key=lambda r: self._row_specs[r][0], reverse=(order == Qt.DescendingOrder))
+        else:
+            self._order.sort(key=lambda r: self._cells[r][column - 1][4], reverse=(order == Qt.DescendingOrder))
+        self.layoutChanged.emit()
+
+    def stat_key(self, row):
+        """Original statistic key shown in view row `row`."""
+        return self._stat_keys[self._order[row]]
+
+    def field_name(self, column):
+        """Field name of column `column` (None for the 'Statistic' column)."""
+        return self._headers[column] if 0 < column < len(self._headers) else None
+
+    def row_texts(self, row):
+        """Display texts of every column in view row `row`, in one call."""
+        row = self._order[row]
+        texts = [self._row_specs[row][0]]
+        texts.extend(cell[0] for cell in self._cells[row])
+        return texts
+
+
 class AnalysisResultsDialog(QDialog):
     """
     Floating dialog to display analysis results (Table, Charts, Correlation, Validation).
     """
+    _CORR_BRUSHES = _build_correlation_brushes()
+    _CORR_FG_LIGHT = QtGui.QBrush(QtGui.QColor(255, 255, 255))
+    _CORR_FG_DARK = QtGui.QBrush(QtGui.QColor(0, 0, 0))
+    _FG_RED = QtGui.QBrush(QtGui.QColor(255, 0, 0))
     def __init__(self, parent=None, results_data=None, layer=None, detailed_options=None, was_analyzing_selection=False):
         super().__init__(parent)
         self.setWindowTitle(self.tr("Analysis Results"))
@@ -88,6 +377,11 @@ class AnalysisResultsDialog(QDialog):
     def tr(self, message):
          return QtCore.QCoreApplication.translate("AnalysisResultsDialog", message)
 
+    def changeEvent(self, event):
+        if event.type() == QtCore.QEvent.LanguageChange:
+            _stat_label.cache_clear()
+        super().changeEvent(event)
+
     def _init_ui(self):
         self.main_layout = QVBoxLayout(self)
         
@@ -96,11 +390,14 @@ class AnalysisResultsDialog(QDialog):
         # --- Tab 1: Table ---
         self.tab_table = QWidget()
         table_layout = QVBoxLayout(self.tab_table)
-        self.resultsTableWidget = QTableWidget()
-        self.resultsTableWidget.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        self.resultsTableWidget.setAlternatingRowColors(True)
-        self.resultsTableWidget.setSortingEnabled(True) 
-        table_layout.addWidget(self.resultsTableWidget)
+        self.resultsModel = ResultsModel(self)
+        self.resultsTableView = QTableView()
+        self.resultsTableView.setModel(self.resultsModel)
+        self.resultsTableView.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.resultsTableView.setAlternatingRowColors(True)
+        self.resultsTableView.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.resultsTableView.setSortingEnabled(True) 
+        table_layout.addWidget(self.resultsTableView)
         
         button_layout = QHBoxLayout()
         self.copyButton = QPushButton(self.tr("Copy Table"))
@@ -120,25 +417,25 @@ class AnalysisResultsDialog(QDialog):
         self.tabs.addTab(self.tab_table, self.tr("Table"))
         
         # --- Tab 2: Charts ---
+        # Built on first activation (see _init_charts) so matplotlib is only loaded when needed
         self.tab_charts = QWidget()
         self.charts_layout = QVBoxLayout(self.tab_charts)
-        
-        if MATPLOTLIB_AVAILABLE:
-            self.figure = Figure()
-            self.canvas = FigureCanvas(self.figure)
-            
-            # Field Selector for Charts
-            self.fieldSelector = QComboBox()
-            self.fieldSelector.currentTextChanged.connect(self.update_charts_from_selector)
-            self.charts_layout.addWidget(self.fieldSelector)
-            
-            self.charts_layout.addWidget(self.canvas)
-            self.chart_info_label = QLabel(self.tr("Select a field column in the table to view charts."))
-            self.chart_info_label.setAlignment(Qt.AlignCenter)
-            self.charts_layout.addWidget(self.chart_info_label)
-        else:
-            self.charts_layout.addWidget(QLabel(self.tr("Matplotlib not installed. Charts unavailable.")))
-            self.canvas = None
+        self.charts_placeholder = QLabel(self.tr("Loading charts..."))
+        self.charts_placeholder.setAlignment(Qt.AlignCenter)
+        self.charts_layout.addWidget(self.charts_placeholder)
+        self.figure = None
+        self.canvas = None
+        self.fieldSelector = None
+        self._charts_initialized = False
+        self._pending_chart_field = None
+        # Field currently drawn; selecting another cell in the same column keeps the chart
+        self._last_chart_field = None
+        # Chart redraws are coalesced: a sweep across the table draws only the field it ends on
+        self._chart_request = None
+        self._chart_timer = QtCore.QTimer(self)
+        self._chart_timer.setSingleShot(True)
+        self._chart_timer.setInterval(30)
+        self._chart_timer.timeout.connect(self._draw_requested_chart)
 
         self.tabs.addTab(self.tab_charts, self.tr("Charts"))
         
@@ -162,32 +459,35 @@ class AnalysisResultsDialog(QDialog):
         self.tabs.addTab(self.tab_validation, self.tr("Validation"))
         
         self.main_layout.addWidget(self.tabs)
+        self.tabs.currentChanged.connect(self._on_tab_changed)
 
         # Connect Selection
-        self.resultsTableWidget.cellDoubleClicked.connect(self._on_cell_double_clicked)
-        self.resultsTableWidget.itemSelectionChanged.connect(self.update_charts)
-        self.resultsTableWidget.horizontalHeader().sectionClicked.connect(self.update_charts)
+        self.resultsTableView.doubleClicked.connect(lambda index: self._on_cell_double_clicked(index.row(), index.column()))
+        self.resultsTableView.selectionModel().selectionChanged.connect(lambda *args: self.update_charts())
+        self.resultsTableView.horizontalHeader().sectionClicked.connect(self.update_charts)
 
     def _process_results(self):
         if not self.results_data:
             return
 
-        results = self.results_data
+        # Read-only view of the per-field results; the dict passed in is never modified,
+        # so the same results can be shown again (e.g. served from the dock's cache)
+        results = OrderedDict((name, field_data) for name, field_data in self.results_data.items()
+                              if name not in _EXTRA_RESULT_KEYS)
+        self.analysis_results_cache = results
         
         # Update helper dictionaries
         for fname, field_data in results.items():
             if '_conversion_error_fids' in field_data:
                 self.conversion_error_feature_ids_by_field[fname] = field_data['_conversion_error_fids']
-                del field_data['_conversion_error_fids']
             if '_non_printable_fids' in field_data:
                 self.non_printable_char_feature_ids_by_field[fname] = field_data['_non_printable_fids']
-                del field_data['_non_printable_fids']
         
         # Populate Correlation
-        if '_global_correlation' in results:
-            self.latest_correlation_matrix = results['_global_correlation'] # Store for report
-            self._populate_correlation_matrix(results['_global_correlation'])
-            del results['_global_correlation']
+        corr_data = self.results_data.get('_global_correlation')
+        if corr_data is not None:
+            self.latest_correlation_matrix = corr_data # Store for report
+            self._populate_correlation_matrix(corr_data)
         else:
             self.latest_correlation_matrix = None
             self.correlationTableWidget.clear()
@@ -195,9 +495,9 @@ class AnalysisResultsDialog(QDialog):
             self.correlationTableWidget.setColumnCount(0)
             
         # Handle Validation Results
-        if '_validation_results' in results:
-            self._populate_validation_results(results['_validation_results'])
-            del results['_validation_results']
+        validation_data = self.results_data.get('_validation_results')
+        if validation_data is not None:
+            self._populate_validation_results(validation_data)
         else:
             self.validationResultsTable.clear()
             self.validationResultsTable.setRowCount(0)
@@ -206,152 +506,96 @@ class AnalysisResultsDialog(QDialog):
         field_names = list(results.keys())
         self.populate_results_table(self.analysis_results_cache, field_names)
 
-        # Populate Chart Selector
+        # Populate Chart Selector (only once the Charts tab has been opened)
         if self.canvas:
-            self.fieldSelector.blockSignals(True)
-            self.fieldSelector.clear()
-            self.fieldSelector.addItems(field_names)
-            self.fieldSelector.blockSignals(False)
-            
-            # Default to first numeric field if available
-            for fname in field_names:
-                f_data = results.get(fname, {})
-                if '_histogram_data' in f_data:
-                    self.fieldSelector.setCurrentText(fname)
-                    self.update_charts_from_selector(fname) # Force update
-                    break
-            else:
-                 if field_names: 
-                     self.fieldSelector.setCurrentIndex(0)
-                     self.update_charts_from_selector(field_names[0])
+            self._populate_chart_selector()
+
+    def _on_tab_changed(self, index):
+        if self.tabs.widget(index) is self.tab_charts and not self._charts_initialized:
+            self._init_charts()
+
+    def _init_charts(self):
+        self._charts_initialized = True
+        self.charts_layout.removeWidget(self.charts_placeholder)
+        self.charts_placeholder.deleteLater()
+        
+        if not _load_matplotlib():
+            self.charts_layout.addWidget(QLabel(self.tr("Matplotlib not installed. Charts unavailable.")))
+            return
+        
+        self.figure = Figure()
+        self.canvas = FigureCanvas(self.figure)
+        # One persistent Axes, cleared for each chart instead of being rebuilt
+        self._chart_ax = self.figure.add_subplot(111)
+        
+        # Field Selector for Charts
+        self.fieldSelector = QComboBox()
+        self.fieldSelector.currentTextChanged.connect(self.update_charts_from_selector)
+        self.charts_layout.addWidget(self.fieldSelector)
+        
+        self.charts_layout.addWidget(self.canvas)
+        self.chart_info_label = QLabel(self.tr("Select a field column in the table to view charts."))
+        self.chart_info_label.setAlignment(Qt.AlignCenter)
+        self.charts_layout.addWidget(self.chart_info_label)
+        
+        if self.analysis_results_cache:
+            self._populate_chart_selector()
+
+    def _populate_chart_selector(self):
+        results = self.analysis_results_cache
+        field_names = list(results.keys())
+        self.fieldSelector.blockSignals(True)
+        self.fieldSelector.clear()
+        self.fieldSelector.addItems(field_names)
+        self.fieldSelector.blockSignals(False)
+        
+        # Show the field picked in the table before the tab was opened, if any
+        if self._pending_chart_field in results:
+            self.fieldSelector.setCurrentText(self._pending_chart_field)
+            self.update_charts_from_selector(self._pending_chart_field)
+            return
+        
+        # Default to first numeric field if available
+        for fname in field_names:
+            f_data = results.get(fname, {})
+            if '_histogram_data' in f_data:
+                self.fieldSelector.setCurrentText(fname)
+                self.update_charts_from_selector(fname) # Force update
+                break
+        else:
+             if field_names: 
+                 self.fieldSelector.setCurrentIndex(0)
+                 self.update_charts_from_selector(field_names[0])
 
     def populate_results_table(self, results_data, field_names_for_header):
-        self.resultsTableWidget.clear()
-        if not results_data and not field_names_for_header: return
-        all_stat_names_from_data = set()
-        for field_name, field_data in results_data.items(): all_stat_names_from_data.update(field_data.keys())
+        # Statistic keys across all fields, collected in one set union
+        all_stat_names_from_data = set().union(*results_data.values())
         
-        # Filter out internal keys like '_actual_first_value' AND '_histogram_data'
+        # Filter out internal keys ('_histogram_data', '_conversion_error_fids', ...) and '_actual_first_value' helpers
         all_displayable_stat_names = {stat for stat in all_stat_names_from_data 
-                                      if not stat.endswith('_actual_first_value') 
-                                      and stat != '_histogram_data'
-                                      and stat != '_top_values_raw'}
+                                      if not stat.startswith('_')
+                                      and not stat.endswith('_actual_first_value')}
 
         # --- Determine row order for statistics ---
-        stat_rows_ordered = [] 
-        seen_keys_for_order = set()
-        
-        STAT_KEYS_NUMERIC = FieldProfilerDockWidget.STAT_KEYS_NUMERIC
-        STAT_KEYS_TEXT = FieldProfilerDockWidget.STAT_KEYS_TEXT
-        STAT_KEYS_DATE = FieldProfilerDockWidget.STAT_KEYS_DATE
-        STAT_KEYS_OTHER = FieldProfilerDockWidget.STAT_KEYS_OTHER
-        STAT_KEYS_ERROR = FieldProfilerDockWidget.STAT_KEYS_ERROR
-        
-        predefined_order_source = []
-        temp_seen_for_predefined_order = set()
-        for key_list in [STAT_KEYS_NUMERIC, STAT_KEYS_TEXT, STAT_KEYS_DATE, 
-                         STAT_KEYS_OTHER, STAT_KEYS_ERROR]:
-            for key in key_list:
-                if key not in temp_seen_for_predefined_order:
-                    predefined_order_source.append(key)
-                    temp_seen_for_predefined_order.add(key)
-
-        for key in predefined_order_source:
-            if key in all_displayable_stat_names and key not in seen_keys_for_order:
-                stat_rows_ordered.append(key)
-                seen_keys_for_order.add(key)
-        
-        extras = sorted([key for key in all_displayable_stat_names if key not in seen_keys_for_order])
-        stat_rows_ordered.extend(extras)
-        
-        num_rows = len(stat_rows_ordered)
-        num_cols = len(field_names_for_header) + 1 
-        self.resultsTableWidget.setRowCount(num_rows)
-        self.resultsTableWidget.setColumnCount(num_cols)
-        
-        headers = [self.tr("Statistic")] + field_names_for_header
-        self.resultsTableWidget.setHorizontalHeaderLabels(headers)
-        
-        quality_keywords = ['%', 'Null', 'Empty', 'Error', 'Outlier', 'Spaces', 'Variance', 'Flag', 'Conversion', 'Mismatch', 'Non-Printable'] 
-        dp = self.detailed_options.get('decimal_places', 2)
-        
-        for r, original_stat_key in enumerate(stat_rows_ordered):
-            stat_item = QTableWidgetItem(self.tr(original_stat_key))
-            stat_item.setData(Qt.UserRole, original_stat_key)
-            stat_item.setToolTip(original_stat_key) 
-            
-            is_quality_issue = any(keyword.lower() in original_stat_key.lower() for keyword in quality_keywords) or \
-                               original_stat_key == 'Error'
-            
-            first_field_name_for_color = field_names_for_header[0] if field_names_for_header else None
-            if first_field_name_for_color:
-                 first_field_data = results_data.get(first_field_name_for_color, {})
-                 if original_stat_key == 'Normality (Likely Normal)' and first_field_data.get(original_stat_key) is False:
-                     is_quality_issue = True
-                 if original_stat_key == 'Low Variance Flag' and first_field_data.get(original_stat_key) is True:
-                     is_quality_issue = True
-
-            if is_quality_issue:
-                stat_item.setBackground(QtGui.QColor(255, 240, 240)) 
-            elif original_stat_key.startswith('%') or "Pctl" in original_stat_key or original_stat_key in ['Skewness', 'Kurtosis']:
-                stat_item.setBackground(QtGui.QColor(240, 240, 255)) 
-            else:
-                stat_item.setBackground(QtGui.QColor(230, 230, 230))
-            
-            self.resultsTableWidget.setItem(r, 0, stat_item)
-
-            for c, field_name in enumerate(field_names_for_header):
-                field_data = results_data.get(field_name, {})
-                value = field_data.get(original_stat_key, "")
-                display_text = ""
-                
-                if isinstance(value, bool):
-                    display_text = str(value)
-                elif isinstance(value, float):
-                    if original_stat_key == 'Normality (Shapiro-Wilk p)':
-                         display_text = f"{value:.4g}" if not numpy.isnan(value) else "N/A"
-                    else:
-                         display_text = f"{value:.{dp}f}" if not numpy.isnan(value) else "N/A"
-                elif isinstance(value, list) and original_stat_key != 'Mode(s)':
-                    display_text = "; ".join(map(str, value))
-                elif isinstance(value, list) and original_stat_key == 'Mode(s)':
-                    formatted_modes = []
-                    for v_mode in value:
-                        if isinstance(v_mode, (int, float)):
-                            try:
-                                formatted_modes.append(f"{float(v_mode):.{dp}f}")
-                            except ValueError:
-                                formatted_modes.append(str(v_mode))
-                        else:
-                            formatted_modes.append(str(v_mode))
-                    display_text = ", ".join(formatted_modes)
-                else:
-                    display_text = str(value)
-                
-                item = QTableWidgetItem(display_text)
-                
-                align_right_keywords = ['Count', 'Error', 'Outlier', 'Zero', 'Positive', 'Negative', 'Space', 'Empty', 'Value', 'Length', 'Pctl', 'Optimal Bins']
-                align_right = isinstance(value, (int, float, bool, numpy.number)) or \
-                              '%' in original_stat_key or \
-                              any(kw in original_stat_key for kw in align_right_keywords) 
-
-                item.setTextAlignment(Qt.AlignVCenter | (Qt.AlignRight if align_right else Qt.AlignLeft))
-                
-                if isinstance(value, str) and ('\n' in value or len(value) > 60):
-                    item.setToolTip(value)
-                elif item.text() in ["N/A (Scipy not found)", "N/A (>=3 values needed)", "N/A (<3 valid)"]:
-                    item.setForeground(QtGui.QBrush(Qt.gray))
-
-                self.resultsTableWidget.setItem(r, c + 1, item)
+        stat_rows_ordered = [key for key in FieldProfilerDockWidget._PREDEFINED_STAT_ORDER if key in all_displayable_stat_names]
+        stat_rows_ordered.extend(sorted(all_displayable_stat_names.difference(FieldProfilerDockWidget._PREDEFINED_STAT_INDEX)))
         
-        self.resultsTableWidget.resizeColumnsToContents()
+        locale_name = QtCore.QLocale().name()
+        self.resultsModel.set_results(
+            stat_rows_ordered, field_names_for_header, results_data,
+            self.detailed_options.get('decimal_places', 2),
+            self.tr("Statistic"), lambda stat_key: _stat_label(stat_key, locale_name)
+        )
+        # Keep the predefined statistic order until the user sorts by a column
+        self.resultsTableView.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.resultsTableView.resizeColumnsToContents()
 
     def _populate_correlation_matrix(self, corr_data):
         self.correlationTableWidget.clear()
         if 'Error' in corr_data: 
             self.correlationTableWidget.setRowCount(1); self.correlationTableWidget.setColumnCount(1)
             item = QTableWidgetItem(corr_data['Error'])
-            item.setForeground(QtGui.QBrush(Qt.red))
+            item.setForeground(self._FG_RED)
             self.correlationTableWidget.setItem(0, 0, item)
             self.correlationTableWidget.resizeColumnsToContents()
             return
@@ -359,34 +603,53 @@ class AnalysisResultsDialog(QDialog):
         fields = corr_data.get('fields', [])
         matrix = corr_data.get('matrix', [])
         
-        if not fields or not matrix: return
+        if not fields or len(matrix) == 0: return
         
         n = len(fields)
-        self.correlationTableWidget.setRowCount(n)
-        self.correlationTableWidget.setColumnCount(n)
-        self.correlationTableWidget.setHorizontalHeaderLabels(fields)
-        self.correlationTableWidget.setVerticalHeaderLabels(fields)
-        
-        for r in range(n):
-            for c in range(n):
-                val = matrix[r][c]
-                item = QTableWidgetItem(f"{val:.2f}")
-                item.setTextAlignment(Qt.AlignCenter)
-                
-                bg_color = QtGui.QColor(255, 255, 255)
-                if val > 0:
-                    intensity = int(255 * (1 - abs(val)))
-                    bg_color = QtGui.QColor(intensity, intensity, 255)
-                elif val < 0:
-                    intensity = int(255 * (1 - abs(val)))
-                    bg_color = QtGui.QColor(255, intensity, intensity)
-                
-                item.setBackground(bg_color)
-                if abs(val) > 0.6: item.setForeground(QtGui.QColor(255, 255, 255) if val > 0 else QtGui.QColor(0,0,0))
-                
-                self.correlationTableWidget.setItem(r, c, item)
+        table = self.correlationTableWidget
+        table.setUpdatesEnabled(False)
+        table.blockSignals(True)
+        try:
+            self.correlationTableWidget.setRowCount(n)
+            self.correlationTableWidget.setColumnCount(n)
+            self.correlationTableWidget.setHorizontalHeaderLabels(fields)
+            self.correlationTableWidget.setVerticalHeaderLabels(fields)
+        
+            # Brush indices, foreground choice and cell text for the whole matrix in one pass;
+            # NaN (no overlapping data) stays on the white, r = 0 brush
+            m = numpy.ascontiguousarray(matrix, dtype=numpy.float64)
+            brush_idx, fg_codes = _correlation_cell_styles(m)
+            texts = corr_data.get('labels') or numpy.char.mod("%.2f", m).tolist()
+            brush_idx = brush_idx.tolist()
+            fg_codes = fg_codes.tolist()
+        
+            corr_brushes = self._CORR_BRUSHES
+            fg_brushes = (None, self._CORR_FG_LIGHT, self._CORR_FG_DARK)
+            center = Qt.AlignCenter
+            set_item = table.setItem
+            for r in range(n):
+                row_texts, row_idx, row_fg = texts[r], brush_idx[r], fg_codes[r]
+                for c in range(n):
+                    item = QTableWidgetItem(row_texts[c])
+                    item.setTextAlignment(center)
+                    item.setBackground(corr_brushes[row_idx[c]])
+                    if row_fg[c]: item.setForeground(fg_brushes[row_fg[c]])
+                    set_item(r, c, item)
+        finally:
+            table.blockSignals(False)
+            table.setUpdatesEnabled(True)
         
-        self.correlationTableWidget.resizeColumnsToContents()
+        # Every cell is a short fixed-format number, so size columns from the widest
+        # possible value and the header labels instead of measuring all n*n cells
+        cell_fm = table.fontMetrics()
+        header = table.horizontalHeader()
+        header_fm = header.fontMetrics()
+        cell_advance = getattr(cell_fm, 'horizontalAdvance', cell_fm.width)
+        header_advance = getattr(header_fm, 'horizontalAdvance', header_fm.width)
+        padding = 2 * table.style().pixelMetric(QtWidgets.QStyle.PM_HeaderMargin) + 8
+        cell_width = cell_advance("-0.00") + padding
+        for c, field in enumerate(fields):
+            header.resizeSection(c, max(cell_width, header_advance(field) + padding))
 
     def _populate_validation_results(self, val_data):
         self.validationResultsTable.clearContents()
@@ -398,21 +661,28 @@ class AnalysisResultsDialog(QDialog):
         counts = val_data.get('fail_counts', [])
         total = val_data.get('total_checked', 0)
         
-        self.validationResultsTable.setRowCount(len(rules))
-        for i, rule in enumerate(rules):
-            count = counts[i]
-            pct = (count / total * 100) if total > 0 else 0
+        table = self.validationResultsTable
+        table.setUpdatesEnabled(False)
+        table.blockSignals(True)
+        try:
+            self.validationResultsTable.setRowCount(len(rules))
+            for i, rule in enumerate(rules):
+                count = counts[i]
+                pct = (count / total * 100) if total > 0 else 0
             
-            item_rule = QTableWidgetItem(rule)
-            item_count = QTableWidgetItem(str(count))
-            item_pct = QTableWidgetItem(f"{pct:.2f}%")
+                item_rule = QTableWidgetItem(rule)
+                item_count = QTableWidgetItem(str(count))
+                item_pct = QTableWidgetItem(f"{pct:.2f}%")
             
-            if count > 0:
-                item_count.setForeground(QtGui.QColor(255, 0, 0)) 
+                if count > 0:
+                    item_count.setForeground(self._FG_RED) 
             
-            self.validationResultsTable.setItem(i, 0, item_rule)
-            self.validationResultsTable.setItem(i, 1, item_count)
-            self.validationResultsTable.setItem(i, 2, item_pct)
+                self.validationResultsTable.setItem(i, 0, item_rule)
+                self.validationResultsTable.setItem(i, 1, item_count)
+                self.validationResultsTable.setItem(i, 2, item_pct)
+        finally:
+            table.blockSignals(False)
+            table.setUpdatesEnabled(True)
 
     def _on_cell_double_clicked(self, row, column):
         if column == 0:
@@ -424,13 +694,9 @@ class AnalysisResultsDialog(QDialog):
              if self.iface: self.iface.messageBar().pushMessage(self.tr("Selection Error"), self.tr("No valid layer available."), level=Qgis.Warning)
              return
 
-        stat_name_item = self.resultsTableWidget.item(row, 0)
-        field_header_item = self.resultsTableWidget.horizontalHeaderItem(column)
-
-        if not stat_name_item or not field_header_item: return
-
-        original_statistic_key = stat_name_item.data(Qt.UserRole)
-        field_name_for_selection = field_header_item.text()
+        original_statistic_key = self.resultsModel.stat_key(row)
+        field_name_for_selection = self.resultsModel.field_name(column)
+        if not field_name_for_selection: return
         field_qobj = current_layer.fields().field(field_name_for_selection)
         if not field_qobj: return
 
@@ -449,12 +715,12 @@ class AnalysisResultsDialog(QDialog):
             expression = f"{quoted_field_name} != trim({quoted_field_name}) AND length(trim({quoted_field_name})) > 0"
         elif original_statistic_key == 'Conversion Errors' and is_numeric_field:
             ids_to_select_directly = self.conversion_error_feature_ids_by_field.get(field_name_for_selection, [])
-            if not ids_to_select_directly: 
+            if len(ids_to_select_directly) == 0: 
                 if self.iface: self.iface.messageBar().pushMessage(self.tr("Info"), self.tr("No features with conversion errors were recorded for this field."), level=Qgis.Info); return
         
         elif original_statistic_key == 'Non-Printable Chars Count' and is_string_field:
             ids_to_select_directly = self.non_printable_char_feature_ids_by_field.get(field_name_for_selection, [])
-            if not ids_to_select_directly: 
+            if len(ids_to_select_directly) == 0: 
                 if self.iface: self.iface.messageBar().pushMessage(self.tr("Info"), self.tr("No features with non-printable characters were recorded for this field."), level=Qgis.Info); return
 
         elif original_statistic_key == 'Outliers (IQR)' and is_numeric_field:
@@ -462,7 +728,7 @@ class AnalysisResultsDialog(QDialog):
              q1_val = field_stats.get('Q1')
              q3_val = field_stats.get('Q3')
              iqr_val = field_stats.get('IQR')
-             if all(isinstance(x, (int, float)) and not numpy.isnan(x) for x in [q1_val, q3_val, iqr_val]):
+             if all(isinstance(x, (int, float)) and not _isnan(x) for x in [q1_val, q3_val, iqr_val]):
                  lower = q1_val - 1.5 * iqr_val
                  upper = q3_val + 1.5 * iqr_val
                  expression = f"({quoted_field_name} < {lower} OR {quoted_field_name} > {upper}) AND {quoted_field_name} IS NOT NULL"
@@ -478,7 +744,7 @@ class AnalysisResultsDialog(QDialog):
 
         elif original_statistic_key in ['Min', 'Max'] and is_numeric_field:
              val = self.analysis_results_cache.get(field_name_for_selection, {}).get(original_statistic_key)
-             if isinstance(val, (int, float, numpy.number)) and not numpy.isnan(val):
+             if isinstance(val, (int, float, numpy.number)) and not _isnan(val):
                   expression = f"{quoted_field_name} = {float(val)}"
              else:
                   if self.iface: self.iface.messageBar().pushMessage(self.tr("Selection Info"), self.tr("Value not available for selection."), level=Qgis.Info); return
@@ -504,7 +770,7 @@ class AnalysisResultsDialog(QDialog):
         
         elif original_statistic_key in ['Min Outlier', 'Max Outlier'] and is_numeric_field:
              val = self.analysis_results_cache.get(field_name_for_selection, {}).get(original_statistic_key)
-             if isinstance(val, (int, float, numpy.number)) and not numpy.isnan(val):
+             if isinstance(val, (int, float, numpy.number)) and not _isnan(val):
                   expression = f"{quoted_field_name} = {float(val)}"
              else:
                   if self.iface: self.iface.messageBar().pushMessage(self.tr("Selection Info"), self.tr("Outlier value n/a."), level=Qgis.Info); return
@@ -538,39 +804,29 @@ class AnalysisResultsDialog(QDialog):
             if 'Unique Values (Top)_actual_first_value' not in cached_field_results:
                  if self.iface: self.iface.messageBar().pushMessage(self.tr("Selection Info"), self.tr("No specific unique value cached for selection."), level=Qgis.Info); return
             
+            to_literal = _UNIQUE_VALUE_LITERALS.get(type(actual_first_value))
+            if to_literal is None and isinstance(actual_first_value, numpy.number):
+                to_literal = _number_literal
+            
             if actual_first_value is None:
                  expression = f"{quoted_field_name} IS NULL"
-            elif isinstance(actual_first_value, str):
-                if hasattr(QgsExpression, 'quotedValue'):
-                    expression = f"{quoted_field_name} = {QgsExpression.quotedValue(actual_first_value)}"
-                else: 
-                     escaped_val = actual_first_value.replace("'", "''") 
-                     expression = f"{quoted_field_name} = '{escaped_val}'"
-            elif isinstance(actual_first_value, (int, float, numpy.number)): 
-                if numpy.isnan(actual_first_value): 
-                    if self.iface: self.iface.messageBar().pushMessage(self.tr("Info"), self.tr("Cannot select NaN (Not a Number) directly."), level=Qgis.Info); return
-                expression = f"{quoted_field_name} = {float(actual_first_value)}"
-            elif isinstance(actual_first_value, QDate):
-                if hasattr(QgsExpression, 'quotedValue'):
-                    expression = f"{quoted_field_name} = {QgsExpression.quotedValue(actual_first_value)}"
-                else:
-                    expression = f"{quoted_field_name} = date('{actual_first_value.toString(Qt.ISODate)}')"
-            elif isinstance(actual_first_value, QDateTime):
-                if hasattr(QgsExpression, 'quotedValue'):
-                    expression = f"{quoted_field_name} = {QgsExpression.quotedValue(actual_first_value)}"
-                else:
-                    iso_string = actual_first_value.toString(Qt.ISODate) 
-                    expression = f"{quoted_field_name} = datetime('{iso_string}')"
-            else:
+            elif to_literal is None:
                  if self.iface: self.iface.messageBar().pushMessage(self.tr("Warning"), self.tr("Cannot select unique value of type: {0}").format(type(actual_first_value).__name__), level=Qgis.Warning); return
+            else:
+                literal = to_literal(actual_first_value)
+                if literal is None:
+                    if self.iface: self.iface.messageBar().pushMessage(self.tr("Info"), self.tr("Cannot select NaN (Not a Number) directly."), level=Qgis.Info); return
+                expression = f"{quoted_field_name} = {literal}"
         
         else:
-              if self.iface: self.iface.messageBar().pushMessage(self.tr("Selection Info"), self.tr("Feature selection is not available for '{0}'.").format(self.tr(original_statistic_key)), level=Qgis.Info); return
+              if self.iface: self.iface.messageBar().pushMessage(self.tr("Selection Info"), self.tr("Feature selection is not available for '{0}'.").format(_stat_label(original_statistic_key, QtCore.QLocale().name())), level=Qgis.Info); return
 
         if expression:
             self._select_features_by_expression(current_layer, field_name_for_selection, expression)
         elif ids_to_select_directly is not None:
-            self._select_features_by_ids(current_layer, field_name_for_selection, ids_to_select_directly)
+            # The task stores a limited number of ids; the statistic holds the full count
+            affected_count = self.analysis_results_cache.get(field_name_for_selection, {}).get(original_statistic_key)
+            self._select_features_by_ids(current_layer, field_name_for_selection, ids_to_select_directly, affected_count)
 
 
     def _select_features_by_expression(self, layer, field_name, expression_string):
@@ -580,7 +836,6 @@ class AnalysisResultsDialog(QDialog):
                 selection_mode = QgsVectorLayer.IntersectSelection
             
             num_selected = layer.selectByExpression(expression_string, selection_mode)
-            if self.iface: self.iface.mapCanvas().refresh()
             
             msg = self.tr("Selected {0} features for field '{1}' where: {2}").format(num_selected, field_name, expression_string)
             if self.was_analyzing_selected_features and selection_mode == QgsVectorLayer.IntersectSelection:
@@ -592,10 +847,11 @@ class AnalysisResultsDialog(QDialog):
         except Exception as e:
              if self.iface: self.iface.messageBar().pushMessage(self.tr("Selection Error"), self.tr("Error selecting features by expression: {0}").format(str(e)), level=Qgis.Critical)
 
-    def _select_features_by_ids(self, layer, field_name, fids_to_select):
+    def _select_features_by_ids(self, layer, field_name, fids_to_select, affected_count=None):
         try:
             num_selected = 0
-            final_ids_for_selection = list(fids_to_select)
+            # Task results carry int64 arrays; selectByIds wants a list of Python ints
+            final_ids_for_selection = fids_to_select.tolist() if isinstance(fids_to_select, numpy.ndarray) else list(fids_to_select)
 
             if not final_ids_for_selection:
                  if self.iface: self.iface.messageBar().pushMessage(self.tr("Info"), self.tr("No feature IDs provided for selection."), level=Qgis.Info, duration=5); return
@@ -611,60 +867,61 @@ class AnalysisResultsDialog(QDialog):
                 num_selected = len(final_ids_for_selection)
                 msg_suffix = "."
             
-            if self.iface: self.iface.mapCanvas().refresh()
-            
             msg = self.tr("Selected {0} features for field '{1}' based on stored IDs{2}").format(num_selected, field_name, msg_suffix)
+            if isinstance(affected_count, int) and affected_count > len(final_ids_for_selection):
+                msg += self.tr(" Only the first {0} of {1} affected features were stored.").format(len(final_ids_for_selection), affected_count)
             if self.iface: self.iface.messageBar().pushMessage(self.tr("Selection Succeeded"), msg, level=Qgis.Success, duration=7)
         except Exception as e:
             if self.iface: self.iface.messageBar().pushMessage(self.tr("Selection Error"), self.tr("Error selecting features by IDs: {0}").format(str(e)), level=Qgis.Critical)
 
+    def _results_table_rows(self):
+        """
+        Header row plus an iterator yielding one list of cell texts per table row
+        (newlines flattened), in view order. Rows are produced lazily so exports
+        can write them as they go.
+        """
+        model = self.resultsModel
+        row_texts = model.row_texts
+        headers = [model.headerData(c, Qt.Horizontal) for c in range(model.columnCount())]
+        return headers, ([text.replace("\n", " | ") for text in row_texts(r)] for r in range(model.rowCount()))
+
     def copy_results_to_clipboard(self):
-        if self.resultsTableWidget.rowCount() == 0 or self.resultsTableWidget.columnCount() == 0:
+        if self.resultsModel.rowCount() == 0 or self.resultsModel.columnCount() == 0:
             if self.iface: self.iface.messageBar().pushMessage(self.tr("Info"), self.tr("No results to copy."), level=Qgis.Info); return
         clipboard = QApplication.clipboard()
         if not clipboard:
              if self.iface: self.iface.messageBar().pushMessage(self.tr("Error"), self.tr("Could not access clipboard."), level=Qgis.Critical); return
-        output = ""
-        headers = [self.resultsTableWidget.horizontalHeaderItem(c).text() for c in range(self.resultsTableWidget.columnCount())]
-        output += "\t".join(headers) + "\n"
-        for r in range(self.resultsTableWidget.rowCount()):
-            row_data = []
-            for c in range(self.resultsTableWidget.columnCount()):
-                 item = self.resultsTableWidget.item(r, c)
-                 cell_text = item.text().replace("\n", " | ") if item else ""
-                 row_data.append(cell_text)
-            output += "\t".join(row_data) + "\n"
-        clipboard.setText(output)
+        headers, rows = self._results_table_rows()
+        lines = ["\t".join(headers)]
+        lines.extend("\t".join(row_data) for row_data in rows)
+        clipboard.setText("\n".join(lines) + "\n")
         if self.iface: self.iface.messageBar().pushMessage(self.tr("Success"), self.tr("Table results copied to clipboard."), level=Qgis.Success)
 
     def export_results_to_csv(self):
-        if self.resultsTableWidget.rowCount() == 0 or self.resultsTableWidget.columnCount() == 0:
+        if self.resultsModel.rowCount() == 0 or self.resultsModel.columnCount() == 0:
              if self.iface: self.iface.messageBar().pushMessage(self.tr("Info"), self.tr("No results to export."), level=Qgis.Info); return
         
         default_filename = "field_profiler_results.csv"
         current_qgs_layer = self.layer
         if current_qgs_layer: 
-            layer_name_sanitized = re.sub(r'[^\w\.-]', '_', current_qgs_layer.name())
+            layer_name_sanitized = _UNSAFE_FILENAME_CHARS.sub('_', current_qgs_layer.name())
             default_filename = f"{layer_name_sanitized}_profile.csv"
             
         file_path, _ = QFileDialog.getSaveFileName(self, self.tr("Export Results to CSV"), default_filename, self.tr("CSV Files (*.csv);;All Files (*)"))
         if not file_path: return
         
-        try:
-            with open(file_path, 'w', newline='', encoding='utf-8-sig') as csvfile:
-                writer = csv.writer(csvfile, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-                headers = [self.resultsTableWidget.horizontalHeaderItem(c).text() for c in range(self.resultsTableWidget.columnCount())]
-                writer.writerow(headers)
-                for r in range(self.resultsTableWidget.rowCount()):
-                    row_data = []
-                    for c in range(self.resultsTableWidget.columnCount()):
-                        item = self.resultsTableWidget.item(r, c)
-                        cell_text = item.text().replace("\n", " | ") if item else ""
-                        row_data.append(cell_text)
-                    writer.writerow(row_data)
-            if self.iface: self.iface.messageBar().pushMessage(self.tr("Success"), self.tr("Results successfully exported to CSV: {0}").format(file_path), level=Qgis.Success)
-        except Exception as e: 
-             if self.iface: self.iface.messageBar().pushMessage(self.tr("Error"), self.tr("Could not export results to CSV: ") + str(e), level=Qgis.Critical)
+        # The table texts are gathered here; the file is written by a background task
+        headers, rows = self._results_table_rows()
+        self._csv_export_task = CsvExportTask(file_path, headers, list(rows))
+        self._csv_export_task.exportFinished.connect(self._on_csv_export_finished)
+        QgsApplication.taskManager().addTask(self._csv_export_task)
+
+    def _on_csv_export_finished(self, success, detail):
+        self._csv_export_task = None
+        if success:
+            if self.iface: self.iface.messageBar().pushMessage(self.tr("Success"), self.tr("Results successfully exported to CSV: {0}").format(detail), level=Qgis.Success)
+        else:
+            if self.iface: self.iface.messageBar().pushMessage(self.tr("Error"), self.tr("Could not export results to CSV: ") + detail, level=Qgis.Critical)
 
     def export_results_to_html(self):
         if not self.analysis_results_cache:
@@ -679,10 +936,9 @@ class AnalysisResultsDialog(QDialog):
             layer_name = current_layer.name() if current_layer else "Unknown Layer"
             
             generator = ReportGenerator(layer_name)
-            html_content = generator.generate_report(self.analysis_results_cache, getattr(self, 'latest_correlation_matrix', None))
-            
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            # Streamed straight to the file rather than assembled in memory first
+            with open(filename, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                generator.write_report(f, self.analysis_results_cache, getattr(self, 'latest_correlation_matrix', None))
                 
             if self.iface: self.iface.messageBar().pushMessage(self.tr("Success"), self.tr("Report exported successfully."), level=Qgis.Success)
             
@@ -694,53 +950,61 @@ class AnalysisResultsDialog(QDialog):
         self.update_charts(field_name_override=field_name)
 
     def update_charts(self, clicked_column_index=None, field_name_override=None):
-        if not MATPLOTLIB_AVAILABLE or not self.canvas: return
-        
         field_name = None
         
         # Priority 1: Direct Name Override (from Combo Box)
         if field_name_override:
             field_name = field_name_override
-            # update selection in table to match if found? 
-            # might be annoying if user just wants to browse charts. 
-            # Let's just sync the combo box state to match.
         
         # Priority 2: Column Index (from Table Header Click)
         elif isinstance(clicked_column_index, int):
             col = clicked_column_index
             if col > 0:
-                 header = self.resultsTableWidget.horizontalHeaderItem(col)
-                 if header: field_name = header.text()
+                 field_name = self.resultsModel.field_name(col)
         
         # Priority 3: Selection (from Table Cell Click)
         else:
-            selected_items = self.resultsTableWidget.selectedItems()
-            if selected_items:
-                col = selected_items[0].column()
+            selected_indexes = self.resultsTableView.selectionModel().selectedIndexes()
+            if selected_indexes:
+                col = selected_indexes[0].column()
                 if col > 0:
-                     header = self.resultsTableWidget.horizontalHeaderItem(col)
-                     if header: field_name = header.text()
+                     field_name = self.resultsModel.field_name(col)
 
         if not field_name: return
         
+        # Charts not built yet: remember the field for when the tab is opened
+        if not self.canvas:
+            self._pending_chart_field = field_name
+            return
+        
         # Sync Combo Box if it didn't trigger this
-        if self.fieldSelector.currentText() != field_name:
-            self.fieldSelector.blockSignals(True)
-            self.fieldSelector.setCurrentText(field_name)
-            self.fieldSelector.blockSignals(False)
+        if not field_name_override:
+            selector = self.fieldSelector
+            if selector.currentText() != field_name:
+                selector.blockSignals(True)
+                selector.setCurrentText(field_name)
+                selector.blockSignals(False)
+
+        if field_name == self._last_chart_field:
+            self._chart_timer.stop()
+            return
+        
+        self._chart_request = field_name
+        self._chart_timer.start()
 
+    def _draw_requested_chart(self):
+        field_name = self._chart_request
         field_data = self.analysis_results_cache.get(field_name)
         if not field_data: return
         
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
+        ax = self._chart_ax
+        ax.cla()
         
         QgsMessageLog.logMessage(f"Updating chart for {field_name}. Keys: {list(field_data.keys())}", "FieldProfiler", Qgis.Info)
 
         if '_histogram_data' in field_data:
-            hist_counts, bin_edges = field_data['_histogram_data']
-            width = numpy.diff(bin_edges)
-            ax.bar(bin_edges[:-1], hist_counts, width=width, align='edge', alpha=0.7)
+            hist_counts, bin_edges, bin_widths = field_data['_histogram_data']
+            ax.bar(bin_edges[:-1], hist_counts, width=bin_widths, align='edge', alpha=0.7)
             ax.set_title(f"Histogram: {field_name}")
             ax.set_xlabel("Value")
             ax.set_ylabel("Frequency")
@@ -749,9 +1013,16 @@ class AnalysisResultsDialog(QDialog):
         elif '_top_values_raw' in field_data:
             top_vals = field_data['_top_values_raw']
             if top_vals:
-                labels = [str(v[0])[:15] for v in top_vals]
-                counts = [v[1] for v in top_vals]
-                x_pos = range(len(labels))
+                # Labels and counts are pre-split by the task; split the raw pairs otherwise
+                chart_data = field_data.get('_top_values_chart')
+                if chart_data:
+                    labels, counts = chart_data
+                else:
+                    values, counts = zip(*top_vals)
+                    labels = [str(v)[:15] for v in values]
+                # Bars stay at integer positions: values sharing a 15-character prefix
+                # would be merged into one bar if the labels were used as categories
+                x_pos = numpy.arange(len(labels))
                 ax.bar(x_pos, counts, align='center', alpha=0.7)
                 ax.set_xticks(x_pos)
                 ax.set_xticklabels(labels, rotation=45, ha='right')
@@ -765,11 +1036,18 @@ class AnalysisResultsDialog(QDialog):
              ax.text(0.5, 0.5, "No chart available for this field type", ha='center', va='center')
              self.chart_info_label.setText(f"No specific chart for field: {field_name}")
 
-        self.canvas.draw()
+        # Repaint on the next event-loop pass rather than blocking here
+        self.canvas.draw_idle()
+        self._last_chart_field = field_name
+
+
+# Most results cache entries (one per analyzed field plus one per run's extras) kept
+# by the dock; the least recently used are dropped first
+_RESULTS_CACHE_SIZE = 64
 
 
 class FieldProfilerDockWidget(QDockWidget):
-    STAT_KEYS_NUMERIC = [
+    STAT_KEYS_NUMERIC = (
         'Non-Null Count', 'Null Count', '% Null', 'Conversion Errors',
         'Min', 'Max', 'Range', 'Sum', 'Mean', 'Median', 'Stdev (pop)', 'Mode(s)',
         'Variety (distinct)', 'Q1', 'Q3', 'IQR',
@@ -777,11 +1055,11 @@ class FieldProfilerDockWidget(QDockWidget):
         'Low Variance Flag',
         'Zeros', 'Positives', 'Negatives', 'CV %',
         'Integer Values', 'Decimal Values', '% Integer Values',
-        'Skewness', 'Kurtosis', 'Normality (Shapiro-Wilk p)', 'Normality (Likely Normal)',
+        'Skewness', 'Kurtosis', 'Normality (Shapiro-Wilk p)', 'Normality (K² p)', 'Normality (Likely Normal)',
         '1st Pctl', '5th Pctl', '95th Pctl', '99th Pctl',
         'Optimal Bins (Freedman-Diaconis)',
-    ]
-    STAT_KEYS_TEXT = [
+    )
+    STAT_KEYS_TEXT = (
         'Non-Null Count', 'Null Count', '% Null', 'Empty Strings', '% Empty',
         'Leading/Trailing Spaces', 'Internal Multiple Spaces',
         'Variety (distinct)', 'Min Length', 'Max Length', 'Avg Length',
@@ -789,17 +1067,20 @@ class FieldProfilerDockWidget(QDockWidget):
         'Top Words', 'Pattern Matches',
         '% Uppercase', '% Lowercase', '% Titlecase', '% Mixed Case',
         'Non-Printable Chars Count',
-    ]
-    STAT_KEYS_DATE = [
+    )
+    STAT_KEYS_DATE = (
         'Non-Null Count', 'Null Count', '% Null', 'Min Date', 'Max Date',
         'Unique Values (Top)',
         'Common Years', 'Common Months', 'Common Days',
         'Common Hours (Top 3)', '% Midnight Time', '% Noon Time',
         '% Weekend Dates', '% Weekday Dates',
         'Dates Before Today', 'Dates After Today',
-    ]
-    STAT_KEYS_OTHER = [ 'Non-Null Count', 'Null Count', '% Null', 'Status', 'Data Type Mismatch Hint']
-    STAT_KEYS_ERROR = ['Error', 'Status']
+    )
+    STAT_KEYS_OTHER = ('Non-Null Count', 'Null Count', '% Null', 'Status', 'Data Type Mismatch Hint')
+    STAT_KEYS_ERROR = ('Error', 'Status')
+    # Row order for the results table: the tuples above concatenated, first occurrence wins
+    _PREDEFINED_STAT_ORDER = tuple(dict.fromkeys(STAT_KEYS_NUMERIC + STAT_KEYS_TEXT + STAT_KEYS_DATE + STAT_KEYS_OTHER + STAT_KEYS_ERROR))
+    _PREDEFINED_STAT_INDEX = {key: i for i, key in enumerate(_PREDEFINED_STAT_ORDER)}
 
 
     def __init__(self, iface, parent=None):
@@ -827,6 +1108,15 @@ class FieldProfilerDockWidget(QDockWidget):
 
         self.current_task = None
         self.analysis_results_dialog = None
+        # Results of earlier runs, reused when the same layer/filter/field/selection/options
+        # are analyzed again. Per-field entries are keyed by
+        # (layer id, subset string, field, selected ids or None, options); correlation and
+        # validation results by (layer id, subset string, sorted fields, selected ids or None,
+        # options, rules). Least recently used entries beyond _RESULTS_CACHE_SIZE are dropped,
+        # and all entries for a layer as soon as its data, fields or data source change.
+        self._results_cache = OrderedDict()
+        self._cache_watched_layer_ids = set()
+        self._last_progress_update_ms = 0
 
         
     def tr(self, message):
@@ -898,6 +1188,16 @@ class FieldProfilerDockWidget(QDockWidget):
 
         detailed_options_group.setLayout(detailed_options_layout)
         main_input_layout.addWidget(detailed_options_group)
+        # Task option key -> checkbox, read by _get_detailed_options_state
+        self._option_checkboxes = {
+            'numeric_dist_shape': self.chk_numeric_dist_shape,
+            'numeric_adv_percentiles': self.chk_numeric_adv_percentiles,
+            'numeric_int_decimal': self.chk_numeric_int_decimal,
+            'numeric_outlier_details': self.chk_numeric_outlier_details,
+            'text_case_analysis': self.chk_text_case_analysis,
+            'text_rarity_nonprintable': self.chk_text_rarity_nonprintable,
+            'date_time_weekend': self.chk_date_time_weekend,
+        }
         
         # --- Analyze Button and Progress Bar ---
         self.analyzeButton = QPushButton(self.tr("Analyze Selected Fields"))
@@ -931,23 +1231,25 @@ class FieldProfilerDockWidget(QDockWidget):
 
         if layer and isinstance(layer, QgsVectorLayer):
             self.fieldListWidget.setEnabled(True); self.selectedOnlyCheckbox.setEnabled(True); self.analyzeButton.setEnabled(True)
-            for field in layer.fields(): item_text = f"{field.name()} ({field.typeName()})"; self.fieldListWidget.addItem(item_text)
+            # One relayout for the whole field list rather than one per added item
+            field_list = self.fieldListWidget
+            field_list.setUpdatesEnabled(False)
+            field_list.blockSignals(True)
+            try:
+                for field in layer.fields():
+                    item = QListWidgetItem(f"{field.name()} ({field.typeName()})")
+                    item.setData(Qt.UserRole, field.name())
+                    field_list.addItem(item)
+            finally:
+                field_list.blockSignals(False)
+                field_list.setUpdatesEnabled(True)
         else:
             self.fieldListWidget.setEnabled(False); self.selectedOnlyCheckbox.setEnabled(False); self.analyzeButton.setEnabled(False)
 
     def _get_detailed_options_state(self):
-        return {
-            'numeric_dist_shape': self.chk_numeric_dist_shape.isChecked(),
-            'numeric_adv_percentiles': self.chk_numeric_adv_percentiles.isChecked(),
-            'numeric_int_decimal': self.chk_numeric_int_decimal.isChecked(),
-            'numeric_outlier_details': self.chk_numeric_outlier_details.isChecked(),
-            'text_case_analysis': self.chk_text_case_analysis.isChecked(),
-            'text_rarity_nonprintable': self.chk_text_rarity_nonprintable.isChecked(),
-            'date_time_weekend': self.chk_date_time_weekend.isChecked(),
-        }
+        return {key: checkbox.isChecked() for key, checkbox in self._option_checkboxes.items()}
 
     def run_analysis(self):
-        # Check if task is already running
         # Check if task is already running
         if self.current_task:
             try:
@@ -976,7 +1278,7 @@ class FieldProfilerDockWidget(QDockWidget):
         if not selected_list_items:
             self.iface.messageBar().pushMessage(self.tr("Error"), self.tr("Please select one or more fields to analyze."), level=Qgis.Warning); return
 
-        selected_field_names = [item.text().split(" (")[0] for item in selected_list_items]
+        selected_field_names = [item.data(Qt.UserRole) for item in selected_list_items]
         if not selected_field_names: return
 
         # Determine features to analyze
@@ -986,22 +1288,81 @@ class FieldProfilerDockWidget(QDockWidget):
             if not selected_ids:
                 self.iface.messageBar().pushMessage(self.tr("Warning"), self.tr("No features selected for analysis."), level=Qgis.Warning); return
         
-        # Prepare Validation Rules
-        validation_rules = []
+        # Reuse cached results where possible. Correlation and validation need one
+        # pass over every selected field, so fields are only skipped when those are
+        # cached too or cannot be affected by the skipped fields.
+        layer_id = current_layer.id()
+        subset_key = current_layer.subsetString()
+        selection_key = frozenset(selected_ids) if selected_ids else None
+        options_key = frozenset((k, v) for k, v in detailed_options.items() if k != 'decimal_places')
+        rules_key = tuple(r.strip() for r in self.validation_rules_edit.toPlainText().split('\n') if r.strip()) if self.validation_group.isChecked() else ()
+        field_keys = OrderedDict((name, (layer_id, subset_key, name, selection_key, options_key)) for name in selected_field_names)
+        extras_key = (layer_id, subset_key, tuple(sorted(selected_field_names)), selection_key, options_key, rules_key)
+        missing_fields = [name for name, key in field_keys.items() if key not in self._results_cache]
+        numeric_count = sum(1 for name in selected_field_names
+                            if current_layer.fields().lookupField(name) != -1 and current_layer.fields().field(name).isNumeric())
+        extras_needed = extras_key not in self._results_cache and (numeric_count >= 2 or rules_key)
+        if not missing_fields and not extras_needed:
+            self._show_results(self._cached_results(field_keys, extras_key))
+            return
+        fields_to_run = selected_field_names if extras_needed else missing_fields
+
+        # Prepare Validation Rules: parse and prepare each expression once here,
+        # so the task only evaluates ready-made expressions per feature.
+        validation_expressions = []
+        validation_context = None
+        validation_columns = set()
         if self.validation_group.isChecked():
             raw_rules = self.validation_rules_edit.toPlainText().split('\n')
-            validation_rules = [r.strip() for r in raw_rules if r.strip()]
-
-        # Setup Task
+            validation_context = QgsExpressionContext(QgsExpressionContextUtils.globalProjectLayerScopes(current_layer))
+            for rule in (r.strip() for r in raw_rules):
+                if not rule: continue
+                exp = QgsExpression(rule)
+                if exp.hasParserError():
+                    self.iface.messageBar().pushMessage(self.tr("Validation"), self.tr("Skipping rule '{0}': {1}").format(rule, exp.parserErrorString()), level=Qgis.Warning)
+                    continue
+                exp.prepare(validation_context)
+                validation_expressions.append(exp)
+                validation_columns.update(exp.referencedColumns())
+        # Several rules are also combined into one array expression so the task can check
+        # them all with a single evaluation per feature. Each rule ends its own line, so a
+        # trailing '--' comment cannot swallow the rest.
+        validation_batch = None
+        if len(validation_expressions) > 1:
+            validation_batch = QgsExpression("array(\n" + ",\n".join(f"({exp.expression()}\n)" for exp in validation_expressions) + ")")
+            if validation_batch.hasParserError():
+                validation_batch = None
+            else:
+                validation_batch.prepare(validation_context)
+
+        # Minimal request: analyzed fields + rule columns only, geometry only if a rule needs it
+        layer_fields = current_layer.fields()
+        request = QgsFeatureRequest()
+        if selected_ids:
+            request.setFilterFids(selected_ids)
+        if QgsFeatureRequest.ALL_ATTRIBUTES not in validation_columns:
+            field_indices = [layer_fields.lookupField(name) for name in fields_to_run]
+            field_indices += [layer_fields.lookupField(name) for name in validation_columns]
+            request.setSubsetOfAttributes([idx for idx in field_indices if idx != -1])
+        if not any(exp.needsGeometry() for exp in validation_expressions):
+            request.setFlags(QgsFeatureRequest.NoGeometry)
+
+        # Setup Task. The feature source is created here, on the main thread, since
+        # iterating the layer itself from a background task is not thread-safe.
         self.current_task = FieldProfilerTask(
             current_layer, 
-            selected_field_names, 
+            QgsVectorLayerFeatureSource(current_layer),
+            request,
+            fields_to_run, 
             detailed_options, 
             selected_ids=selected_ids if selected_ids else None,
-            validation_rules=validation_rules
+            validation_rules=validation_expressions,
+            validation_context=validation_context,
+            validation_batch=validation_batch
         )
-        self.current_task.analysisFinished.connect(self.on_analysis_finished)
-        self.current_task.progressChanged.connect(lambda p: self.progressBar.setValue(int(p)))
+        self.current_task.analysisFinished.connect(lambda results: self.on_analysis_finished(field_keys, extras_key, results))
+        self.current_task.progressChanged.connect(self._on_progress)
+        self._last_progress_update_ms = 0
         
         # UI Updates
         self.analyzeButton.setText(self.tr("Cancel Analysis"))
@@ -1011,7 +1372,14 @@ class FieldProfilerDockWidget(QDockWidget):
         
         QgsApplication.taskManager().addTask(self.current_task)
 
-    def on_analysis_finished(self, results):
+    def _on_progress(self, value):
+        # Repaint the bar at most every 50 ms; the final value always gets through
+        now_ms = time.monotonic_ns() // 1000000
+        if value >= 100 or now_ms - self._last_progress_update_ms >= 50:
+            self.progressBar.setValue(int(value))
+            self._last_progress_update_ms = now_ms
+
+    def on_analysis_finished(self, field_keys, extras_key, results):
         self.analyzeButton.setText(self.tr("Analyze Selected Fields"))
         self.progressBar.setVisible(False)
         
@@ -1020,6 +1388,71 @@ class FieldProfilerDockWidget(QDockWidget):
             self.current_task = None
             return
 
+        self._store_results(results, field_keys, extras_key)
+        self._show_results(self._cached_results(field_keys, extras_key, results))
+        self.current_task = None
+
+    def _watch_layer_for_cache(self, layer):
+        if layer.id() in self._cache_watched_layer_ids:
+            return
+        self._cache_watched_layer_ids.add(layer.id())
+        layer_id = layer.id()
+        invalidate = lambda *args: self._invalidate_layer_cache(layer_id)
+        layer.dataChanged.connect(invalidate)
+        layer.updatedFields.connect(invalidate)
+        layer.willBeDeleted.connect(invalidate)
+        if hasattr(layer, 'dataSourceChanged'):  # QGIS >= 3.6
+            layer.dataSourceChanged.connect(invalidate)
+
+    def _invalidate_layer_cache(self, layer_id):
+        for key in [k for k in self._results_cache if k[0] == layer_id]:
+            del self._results_cache[key]
+
+    def _store_results(self, results, field_keys, extras_key):
+        layer = QgsProject.instance().mapLayer(extras_key[0])
+        if layer is None:
+            return
+        self._watch_layer_for_cache(layer)
+        cache = self._results_cache
+        for name, field_res in results.items():
+            if name in field_keys and 'Error' not in field_res:
+                cache[field_keys[name]] = field_res
+                cache.move_to_end(field_keys[name])
+        # Runs that skipped cached fields only happen when the extras are already cached
+        # (or there are none), so a partial run never replaces them
+        if extras_key not in cache:
+            cache[extras_key] = {k: v for k, v in results.items() if k in _EXTRA_RESULT_KEYS}
+        cache.move_to_end(extras_key)
+        while len(cache) > _RESULTS_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    def _cached_results(self, field_keys, extras_key, run_results=None):
+        """
+        Results for the current run: those of the run just finished (run_results, which
+        also holds fields that failed and were not cached) completed from the cache.
+        The dialog only reads them.
+        """
+        run_results = run_results or {}
+        cache = self._results_cache
+        results = OrderedDict()
+        for name, key in field_keys.items():
+            field_res = run_results.get(name)
+            if field_res is None and key in cache:
+                cache.move_to_end(key)
+                field_res = cache[key]
+            if field_res is not None:
+                results[name] = field_res
+        if extras_key in cache:
+            cache.move_to_end(extras_key)
+            extras = cache[extras_key]
+        else:
+            extras = run_results
+        for k in _EXTRA_RESULT_KEYS:
+            if k in extras:
+                results[k] = extras[k]
+        return results
+
+    def _show_results(self, results):
         current_layer = self.layerComboBox.currentLayer()
 
         detailed_options = {
@@ -1037,7 +1470,6 @@ class FieldProfilerDockWidget(QDockWidget):
         self.analysis_results_dialog.show()
 
         self.iface.messageBar().pushMessage(self.tr("Success"), self.tr("Analysis complete. Results opened in new window."), level=Qgis.Success)
-        self.current_task = None
 
     def closeEvent(self, event):
         self.hide()
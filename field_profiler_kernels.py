@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Single-pass numeric kernels for the profiling task.
+
+When numba is installed the kernels are JIT-compiled and run in parallel;
+otherwise the NumPy implementations below are used. Results are equivalent up to
+floating-point rounding: the parallel reductions sum in a different order than
+NumPy, so means and sums can differ in the last bits.
+
+The compiled kernels are cached (cache=True) as .nbi/.nbc files in the plugin's
+__pycache__ directory. Where that directory is read-only (e.g. system-wide
+installs) numba falls back to a per-user cache directory, or to compiling the
+kernels again in each session if it cannot write there either.
+"""
+import numpy
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _numeric_value_counts_numpy(values):
+    zeros = numpy.count_nonzero(values == 0)
+    positives = numpy.count_nonzero(values > 0)
+    negatives = numpy.count_nonzero(values < 0)
+    integers = numpy.count_nonzero(numpy.modf(values)[0] == 0)
+    return zeros, positives, negatives, integers
+
+
+if NUMBA_AVAILABLE:
+    @numba.njit(parallel=True, cache=True)
+    def _numeric_value_counts_numba(values):
+        zeros = 0
+        positives = 0
+        negatives = 0
+        integers = 0
+        for i in numba.prange(values.shape[0]):
+            v = values[i]
+            if v == 0.0:
+                zeros += 1
+            elif v > 0.0:
+                positives += 1
+            elif v < 0.0:
+                negatives += 1
+            if v == numpy.floor(v):
+                integers += 1
+        return zeros, positives, negatives, integers
+
+
+def numeric_value_counts(values):
+    """
+    Counts of zero, positive, negative and integer-valued entries of a 1-D
+    float64 array without NaNs, as a (zeros, positives, negatives, integers) tuple.
+    """
+    if NUMBA_AVAILABLE:
+        return tuple(int(c) for c in _numeric_value_counts_numba(values))
+    return tuple(int(c) for c in _numeric_value_counts_numpy(values))
+
+
+def _array_moments_numpy(values):
+    mean = float(values.mean())
+    m2 = float(numpy.square(values - mean).sum())
+    # fmin/fmax skip NaNs
+    return mean, m2, float(numpy.fmin.reduce(values)), float(numpy.fmax.reduce(values))
+
+
+if NUMBA_AVAILABLE:
+    @numba.njit(parallel=True, cache=True)
+    def _array_moments_numba(values):
+        n = values.shape[0]
+        total = 0.0
+        low = numpy.inf
+        high = -numpy.inf
+        for i in numba.prange(n):
+            v = values[i]
+            total += v
+            low = min(low, v)
+            high = max(high, v)
+        mean = total / n
+        m2 = 0.0
+        for i in numba.prange(n):
+            d = values[i] - mean
+            m2 += d * d
+        return mean, m2, low, high
+
+
+def array_moments(values):
+    """
+    Mean, sum of squared deviations from the mean (M2), minimum and maximum of a
+    non-empty 1-D float64 array, as a (mean, m2, min, max) tuple of floats. NaNs
+    propagate into mean and M2 but are skipped by min and max.
+    """
+    if NUMBA_AVAILABLE:
+        return tuple(float(x) for x in _array_moments_numba(values))
+    return _array_moments_numpy(values)
@@ -1,12 +1,19 @@
 # -*- coding: utf-8 -*-
+import csv
+import math
+import operator
+import os
 import random
-import statistics
+import re
 import numpy
 from collections import Counter, OrderedDict
+from itertools import compress, islice
 from datetime import datetime
 
-from qgis.core import (QgsTask, QgsMessageLog, Qgis, QgsFeatureRequest, QgsMapLayer, QgsExpression, QgsExpressionContext, QgsExpressionContextUtils)
-from qgis.PyQt.QtCore import pyqtSignal, QVariant, QDate, QDateTime, QTime
+from qgis.core import QgsTask, QgsMessageLog, Qgis
+from qgis.PyQt.QtCore import pyqtSignal, QVariant, QDate, QDateTime
+
+from .field_profiler_kernels import array_moments, numeric_value_counts
 
 # Check for Scipy
 SCIPY_AVAILABLE = False
@@ -16,10 +23,145 @@ try:
 except ImportError:
     scipy_stats = None
 
+NAN = float('nan')
+# Attribute value types numeric columns convert to float64 without per-value checks
+NATIVE_NUMBER_TYPES = frozenset((float, int))
+
+# Patterns reported under 'Pattern Matches' for text fields (whole-value matches),
+# compiled once at import rather than per value.
+TEXT_PATTERNS = OrderedDict([
+    ('Email', re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")),
+    ('URL', re.compile(r"(?:https?|ftp)://\S+", re.IGNORECASE)),
+    ('Numeric', re.compile(r"\s*[-+]?(?:\d+(?:[.,]\d*)?|[.,]\d+)\s*")),
+    ('ISO Date', re.compile(r"\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2})?)?")),
+    ('Phone', re.compile(r"\+?\d[\d \-().]{5,}\d")),
+])
+# Two or more whitespace characters between non-blank characters
+MULTIPLE_SPACES_RE = re.compile(r"\S\s{2,}\S")
+# str.translate table removing the control characters allowed in text values
+ALLOWED_CONTROL_CHARS_DELETE = str.maketrans('', '', '\t\n\r')
+
+def _pairwise_corrcoef(data):
+    """
+    Pearson correlation between the columns of data (N samples x M fields) using
+    pairwise-complete observations: NaNs only exclude a sample from the pairs it
+    is missing in. Computed with a handful of matrix products instead of a loop
+    over field pairs.
+    """
+    valid = ~numpy.isnan(data)
+    # Centre each column first for numerical stability; NaNs become 0 so they drop out of the sums
+    x = numpy.where(valid, data - numpy.nanmean(data, axis=0), 0.0)
+    v = valid.astype(numpy.float64)
+    n = v.T @ v                    # n[i, j] = rows where both i and j are valid
+    sx = x.T @ v                   # sx[i, j] = sum of x_i over rows where x_j is valid
+    sxx = (x * x).T @ v
+    sxy = x.T @ x
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        cov = sxy - sx * sx.T / n
+        var = sxx - sx * sx / n
+        corr = cov / numpy.sqrt(var * var.T)
+    corr[n < 2] = numpy.nan
+    return numpy.clip(corr, -1.0, 1.0)
+
+def _top_k(values, counts, k):
+    """
+    The k most frequent entries of numpy.unique(..., return_counts=True) output as
+    (value, count) pairs, most frequent first (ties in value order). Uses a partial
+    partition so only the selected entries are sorted.
+    """
+    k = min(k, counts.size)
+    if k <= 0:
+        return []
+    # k-th largest count; entries tied with it are taken in value order
+    kth = -numpy.partition(-counts, k - 1)[k - 1]
+    above = numpy.flatnonzero(counts > kth)
+    idx = numpy.concatenate((above, numpy.flatnonzero(counts == kth)[:k - above.size]))
+    idx = idx[numpy.lexsort((idx, -counts[idx]))]
+    return list(zip(values[idx].tolist(), counts[idx].tolist()))
+
+def _quantiles_from_sorted(sorted_values, levels):
+    """
+    Quantiles of an already sorted 1-D array by linear interpolation between
+    order statistics (same definition as numpy.quantile's default), without
+    partitioning the data again.
+    """
+    pos = numpy.asarray(levels, dtype=numpy.float64) * (sorted_values.size - 1)
+    lo = numpy.floor(pos).astype(numpy.intp)
+    hi = numpy.minimum(lo + 1, sorted_values.size - 1)
+    frac = pos - lo
+    lo_vals = sorted_values[lo]
+    with numpy.errstate(invalid='ignore'):
+        interp = lo_vals + (sorted_values[hi] - lo_vals) * frac
+    return numpy.where(frac == 0, lo_vals, interp)
+
+def _histogram_from_sorted(sorted_values):
+    """
+    Histogram of an already sorted, finite, non-empty 1-D array with numpy's 'auto'
+    bins: the smaller of the Sturges and Freedman-Diaconis widths, the latter floored
+    at half the square-root width. Range and IQR are read off the order statistics,
+    and the counts with one binary search per edge, so no pass over the data is made.
+    """
+    n = sorted_values.size
+    first_edge, last_edge = float(sorted_values[0]), float(sorted_values[-1])
+    data_range = last_edge - first_edge
+    q75, q25 = _quantiles_from_sorted(sorted_values, (0.75, 0.25))
+    fd_width = 2.0 * (q75 - q25) * n ** (-1.0 / 3.0)
+    sturges_width = data_range / (numpy.log2(n) + 1.0)
+    sqrt_width = data_range / numpy.sqrt(n)
+    width = min(max(fd_width, sqrt_width / 2), sturges_width)
+    if first_edge == last_edge:
+        first_edge, last_edge = first_edge - 0.5, last_edge + 0.5
+    n_bins = int(numpy.ceil(data_range / width)) if width else 1
+    bin_edges = numpy.linspace(first_edge, last_edge, n_bins + 1)
+    # Bins are half-open [a, b) except the last, which also holds its right edge
+    starts = numpy.searchsorted(sorted_values, bin_edges[:-1], side='left')
+    hist = numpy.diff(numpy.append(starts, sorted_values.size))
+    return hist, bin_edges
+
+def _float_column(values):
+    """
+    A column of attribute values as float64, with NaN for nulls and for values
+    float() rejects, plus boolean masks of the nulls and of the rejected values.
+    Native int/float values (the usual case for numeric fields) are converted in one
+    call; only the remaining entries (nulls, strings, ...) are handled one by one.
+    """
+    n = len(values)
+    is_number = numpy.fromiter(map(NATIVE_NUMBER_TYPES.__contains__, map(type, values)), dtype=bool, count=n)
+    nulls = numpy.zeros(n, dtype=bool)
+    errors = numpy.zeros(n, dtype=bool)
+    if is_number.all():
+        return numpy.array(values, dtype=numpy.float64), nulls, errors
+    objects = numpy.empty(n, dtype=object)
+    objects[:] = values
+    floats = numpy.full(n, NAN)
+    floats[is_number] = objects[is_number].astype(numpy.float64)
+    for i in numpy.flatnonzero(~is_number).tolist():
+        val = values[i]
+        if val is None or (hasattr(val, 'isNull') and val.isNull()):
+            nulls[i] = True
+            continue
+        try:
+            floats[i] = float(val)
+        except (ValueError, TypeError, OverflowError):
+            errors[i] = True
+    return floats, nulls, errors
+
+def _non_null_values(values):
+    """
+    The entries of a column of attribute values that are not NULL, in order. None is
+    dropped by identity; isNull() is only called on values whose type has it
+    (QVariant, QDate, ...), found once per column rather than probed per value.
+    """
+    nullable_types = {value_type for value_type in set(map(type, values)) if hasattr(value_type, 'isNull')}
+    if not nullable_types:
+        return [val for val in values if val is not None]
+    return [val for val in values if val is not None and not (type(val) in nullable_types and val.isNull())]
+
 class StreamingStats:
     """
     Helper to calculate running statistics (count, min, max, mean, variance)
-    using Welford's algorithm to avoid storing all values.
+    without storing all values. Values arrive in arrays whose partial statistics
+    are merged into the running ones with Chan et al.'s pairwise combination.
     """
     def __init__(self):
         self.count = 0
@@ -28,15 +170,23 @@ class StreamingStats:
         self.mean = 0.0
         self.M2 = 0.0  # For variance calculation
 
-    def update(self, val):
-        self.count += 1
-        if val < self.min_val: self.min_val = val
-        if val > self.max_val: self.max_val = val
-        
-        delta = val - self.mean
-        self.mean += delta / self.count
-        delta2 = val - self.mean
-        self.M2 += delta * delta2
+    def update_array(self, values):
+        """Adds a 1-D float64 array of values."""
+        n_b = values.size
+        if n_b == 0:
+            return
+        # One kernel pass for the chunk's moments (numba when available); min/max skip
+        # NaNs, like the comparisons of a per-value update would
+        mean_b, m2_b, min_b, max_b = array_moments(values)
+        self.min_val = min(self.min_val, min_b)
+        self.max_val = max(self.max_val, max_b)
+
+        n_a = self.count
+        new_count = n_a + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / new_count
+        self.M2 += m2_b + delta * delta * n_a * n_b / new_count
+        self.count = new_count
 
     def variance(self):
         if self.count < 2: return float('nan')
@@ -46,25 +196,138 @@ class StreamingStats:
         if self.count < 2: return float('nan')
         return (self.M2 / self.count)**0.5 # Population Stdev matching original code
 
-class ReservoirSampler:
+class _SkipSchedule:
+    """
+    Replacement schedule of a full reservoir of `size` items, by Vitter's Algorithm L:
+    the gap to the next stream position that enters the reservoir is drawn directly,
+    so random numbers are only drawn for the items kept (about size * log(N / size)
+    of N) instead of one per item.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.count_seen = 0
+        self._w = 1.0
+        self._next_index = None  # 1-based stream position of the next replacement
+
+    def _start_replacing(self):
+        """Called once the reservoir holds size items."""
+        self._w = 1.0
+        self._next_index = self.count_seen
+        self._advance()
+
+    def _advance(self):
+        # 1 - random() lies in (0, 1], keeping the logarithms finite
+        self._w *= math.exp(math.log(1.0 - random.random()) / self.size)
+        self._next_index += int(math.floor(math.log(1.0 - random.random()) / math.log1p(-self._w))) + 1
+
+    def _replacements(self, n):
+        """
+        Consumes the next n stream positions and returns the (offset among those n,
+        reservoir slot) pairs to write, in stream order.
+        """
+        start = self.count_seen
+        end = start + n
+        picks = []
+        while self._next_index <= end:
+            picks.append((self._next_index - start - 1, random.randrange(self.size)))
+            self._advance()
+        self.count_seen = end
+        return picks
+
+class ReservoirSampler(_SkipSchedule):
     """
     Maintains a random sample of a stream of items using Reservoir Sampling.
     Used for approximate Median, Quantiles, Mode on massive datasets.
     """
     def __init__(self, size=500000):
-        self.size = size
+        super().__init__(size)
         self.reservoir = []
-        self.count_seen = 0
 
-    def update(self, item):
-        self.count_seen += 1
-        if len(self.reservoir) < self.size:
-            self.reservoir.append(item)
-        else:
-            # Replace elements with gradually decreasing probability
-            r = random.randint(0, self.count_seen - 1)
-            if r < self.size:
-                self.reservoir[r] = item
+    def update_many(self, items):
+        """Adds the entries of the list items to the stream, in order."""
+        free = self.size - len(self.reservoir)
+        if free > 0:
+            self.reservoir.extend(items[:free])
+            self.count_seen += min(free, len(items))
+            if len(self.reservoir) < self.size:
+                return
+            items = items[free:]
+            self._start_replacing()
+        for offset, slot in self._replacements(len(items)):
+            self.reservoir[slot] = items[offset]
+
+class NumericReservoir(_SkipSchedule):
+    """
+    Reservoir sampler for numeric fields. Values are stored as float64 in a single
+    NumPy buffer so the analysis can run vectorized reductions on it directly instead
+    of converting a list of Python objects. With an expected_count (e.g. the feature
+    count) the buffer is allocated once at its final size; otherwise it grows
+    geometrically up to size. With columns set, each sampled item is a row of that
+    many values and the buffer is 2-D.
+    """
+    def __init__(self, size=500000, expected_count=None, columns=None):
+        super().__init__(size)
+        initial = min(size, expected_count) if expected_count and expected_count > 0 else min(size, 1024)
+        self.row_shape = (columns,) if columns else ()
+        self.buffer = numpy.empty((initial,) + self.row_shape, dtype=numpy.float64)
+        self.filled = 0
+
+    def update_array(self, values):
+        """
+        Feeds a float64 array of items (values, or rows of values) to the sampler.
+        The buffer is filled by slice copy; past that, the scheduled replacements are
+        written with one fancy assignment. A slot replaced more than once within the
+        batch keeps its last replacement, as with one-by-one updates.
+        """
+        take = min(len(values), self.size - self.filled)
+        if take > 0:
+            needed = self.filled + take
+            if needed > len(self.buffer):
+                grown = numpy.empty((min(self.size, max(needed, 2 * len(self.buffer))),) + self.row_shape, dtype=numpy.float64)
+                grown[:self.filled] = self.buffer[:self.filled]
+                self.buffer = grown
+            self.buffer[self.filled:needed] = values[:take]
+            self.filled = needed
+            self.count_seen += take
+        if self.filled < self.size:
+            return
+        if self._next_index is None:
+            self._start_replacing()
+        rest = values[take:]
+        picks = self._replacements(len(rest))
+        if picks:
+            offsets, slots = numpy.array(picks, dtype=numpy.int64).T
+            # Fancy assignment leaves duplicate-index writes in an unspecified order, so
+            # only each slot's last occurrence is written
+            slots, last = numpy.unique(slots[::-1], return_index=True)
+            self.buffer[slots] = rest[offsets[::-1][last]]
+
+    @property
+    def values(self):
+        """View of the sampled values (no copy)."""
+        return self.buffer[:self.filled]
+
+class FeatureIdBuffer:
+    """
+    Keeps the first `capacity` feature ids it is given in an int64 array allocated
+    once; later ids are dropped. Callers count the affected features themselves.
+    """
+    def __init__(self, capacity):
+        self.buffer = numpy.empty(capacity, dtype=numpy.int64)
+        self.filled = 0
+
+    def extend(self, fids):
+        """Stores ids from the iterable fids while there is room (nothing is read once full)."""
+        room = len(self.buffer) - self.filled
+        if room > 0:
+            kept = numpy.fromiter(islice(fids, room), dtype=numpy.int64)
+            self.buffer[self.filled:self.filled + len(kept)] = kept
+            self.filled += len(kept)
+
+    @property
+    def ids(self):
+        """View of the stored ids (no copy)."""
+        return self.buffer[:self.filled]
 
 class FieldProfilerTask(QgsTask):
     """
@@ -72,19 +335,42 @@ class FieldProfilerTask(QgsTask):
     """
     # Signal emitted when analysis is complete with the results dictionary
     analysisFinished = pyqtSignal(dict)
-    
+
     # Constants for memory protection
     MAX_EXACT_VALUES = 1000000 # Switch to streaming/sampling after this many items per field
-    
-    def __init__(self, layer, field_names, config_options, selected_ids=None, validation_rules=None):
+    MAX_STORED_FIDS = 1000 # Feature ids kept per field for selecting conversion errors / non-printable values
+    # Features buffered before their attribute values are processed column-wise
+    INGEST_CHUNK_SIZE = 50000
+
+    # Order statistics computed together for numeric fields: 1st, 5th, Q1, Median, Q3, 95th, 99th
+    QUANTILE_LEVELS = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+    def __init__(self, layer, source, request, field_names, config_options, selected_ids=None,
+                 validation_rules=None, validation_context=None, validation_batch=None):
+        """
+        layer is only read here, on the main thread. Features are pulled from source
+        (a QgsVectorLayerFeatureSource snapshot of the layer) using request, which already
+        restricts attributes/geometry to what the analysis needs. validation_batch is an
+        optional prepared expression returning the results of all validation_rules as
+        one array, so each feature needs a single evaluation.
+        """
         description = f"Profiling {len(field_names)} fields on {layer.name()}"
         super().__init__(description, QgsTask.CanCancel)
-        
-        self.layer = layer
+
+        self.layer_name = layer.name()
+        self.fields = layer.fields()
+        self.source = source
+        self.request = request
         self.field_names = field_names
         self.config_options = config_options
         self.selected_ids = selected_ids
-        self.validation_rules_str = validation_rules if validation_rules else []
+        self.total_count = len(selected_ids) if selected_ids else layer.featureCount()
+        # Validation rules arrive as QgsExpression objects already parsed and prepared
+        # against validation_context on the main thread.
+        self.validation_expressions = validation_rules if validation_rules else []
+        self.validation_rules_str = [exp.expression() for exp in self.validation_expressions]
+        self.validation_context = validation_context
+        self.validation_batch = validation_batch
         self.exception = None
         self.results = OrderedDict()
         self.conversion_error_fids = {}
@@ -95,178 +381,132 @@ class FieldProfilerTask(QgsTask):
         Main execution method running in a background thread.
         """
         try:
-            QgsMessageLog.logMessage(f"Starting analysis for {self.layer.name()}", "FieldProfiler", Qgis.Info)
-            
+            QgsMessageLog.logMessage(f"Starting analysis for {self.layer_name}", "FieldProfiler", Qgis.Info)
+
             # 1. Setup Collection Structures
-            qgs_fields = self.layer.fields()
+            qgs_fields = self.fields
             field_metadata = {}
             collectors = {}
+            max_stored_fids = self.config_options.get('max_stored_fids', self.MAX_STORED_FIDS)
 
             for fname in self.field_names:
                 idx = qgs_fields.lookupField(fname)
                 if idx == -1: 
                     self.results[fname] = {'Error': 'Field not found'}
                     continue
-                
+
                 fobj = qgs_fields.field(idx)
                 meta = {'index': idx, 'object': fobj, 'type': fobj.type()}
                 field_metadata[fname] = meta
-                
+
                 # Initialize collector for this field
                 collectors[fname] = {
                     'null_count': 0,
                     'streaming_stats': StreamingStats() if fobj.isNumeric() else None,
-                    'reservoir': ReservoirSampler(self.MAX_EXACT_VALUES),
+                    'reservoir': NumericReservoir(self.MAX_EXACT_VALUES, self.total_count) if fobj.isNumeric() else ReservoirSampler(self.MAX_EXACT_VALUES),
                     'conversion_errors': 0,
-                    'conversion_error_fids': [],  # Limit size to 1000
-                    'non_printable_fids': [],  # Track features with non-printable chars
+                    'non_printable_count': 0,
+                    # Ids of the first affected features, for selection; the counts above cover all of them
+                    'conversion_error_fids': FeatureIdBuffer(max_stored_fids),
+                    'non_printable_fids': FeatureIdBuffer(max_stored_fids),  # Track features with non-printable chars
                     'is_exact': True,  # Flag if we are still storing all values
                     'original_variants_reservoir': ReservoirSampler(self.MAX_EXACT_VALUES) if fobj.type() in [QVariant.Date, QVariant.DateTime] else None
                 }
 
             # Setup Validation Expressions
-            validation_expressions = []
-            validation_fail_counts = []
-            if self.validation_rules_str:
-                context = QgsExpressionContext()
-                context.appendScope(QgsExpressionContextUtils.globalScope())
-                context.appendScope(QgsExpressionContextUtils.layerScope(self.layer))
-                
-                for rule in self.validation_rules_str:
-                    exp = QgsExpression(rule)
-                    if exp.hasParserError():
-                        self.results['_validation_error'] = f"Parser Error in rule: {rule} - {exp.parserErrorString()}"
-                        # Continue or bust? Let's continue with other rules? Or just skip this one.
-                        # But simpler to just proceed and fail evaluation.
-                    
-                    # exp.prepare(context) # Optimization
-                    validation_expressions.append(exp)
-                    validation_fail_counts.append(0)
-            
-            # Setup Correlation Reservoir (Row-based)
+            validation_expressions = self.validation_expressions
+            validation_context = self.validation_context
+            validation_fail_counts = [0] * len(validation_expressions)
+            # The expressions are already prepared against validation_context; bind the
+            # per-feature calls once so the loop does no attribute lookups
+            validation_evaluators = [(i, exp.evaluate) for i, exp in enumerate(validation_expressions)]
+            set_validation_feature = validation_context.setFeature if validation_evaluators else None
+            evaluate_all_rules = self.validation_batch.evaluate if self.validation_batch is not None else None
+            batch_has_eval_error = self.validation_batch.hasEvalError if self.validation_batch is not None else None
+            rule_count = len(validation_evaluators)
+            check_non_printable = self.config_options.get('text_rarity_nonprintable', True)
+            last_pct = -1
 
             # Setup Correlation Reservoir (Row-based)
-            self.numeric_fields_for_corr = [fname for fname in self.field_names if field_metadata[fname]['object'].isNumeric()]
-            self.row_reservoir = ReservoirSampler(self.MAX_EXACT_VALUES) if len(self.numeric_fields_for_corr) > 1 else None
-
-            # 2. Configure Request
-            request = QgsFeatureRequest()
-            if self.selected_ids:
-                request.setFilterFids(self.selected_ids)
-            
-            # Using NoGeometry to speed up if possible, unless spatial index needed? Not needed here.
-            request.setFlags(QgsFeatureRequest.NoGeometry) 
-            
-            iterator = self.layer.getFeatures(request)
-            total_count = len(self.selected_ids) if self.selected_ids else self.layer.featureCount()
-            
-            # 3. Iterate and Collect
+            self.numeric_fields_for_corr = [fname for fname, meta in field_metadata.items() if meta['object'].isNumeric()]
+            self.row_reservoir = (NumericReservoir(self.MAX_EXACT_VALUES, self.total_count, columns=len(self.numeric_fields_for_corr))
+                                  if len(self.numeric_fields_for_corr) > 1 else None)
+
+            # 2. Iterate the thread-safe source with the prepared request
+            iterator = self.source.getFeatures(self.request)
+            total_count = self.total_count
+
+            # 3. Iterate and Collect. Each feature only has its analyzed attributes copied
+            # out; every INGEST_CHUNK_SIZE rows the buffered rows are processed column-wise.
             count = 0
-            # Pre-calculate reusable lookups to avoid dict hashing inside loop if possible
-            # But the overhead is minimal compared to QGIS reading.
-            
+            field_items = list(field_metadata.items())
+            attr_indices = [meta['index'] for meta in field_metadata.values()]
+            chunk_rows = []
+            chunk_fids = []
+
             for feature in iterator:
-                if self.isCanceled():
-                    return False
-                
-                fid = feature.id()
-                
-                for fname, meta in field_metadata.items():
-                    collector = collectors[fname]
-                    val = feature[meta['index']]
-                    
-                    # Store original QVariant for dates (using reservoir if needed)
-                    if meta['type'] in [QVariant.Date, QVariant.DateTime]:
-                        # Only store if not null
-                         if val is not None and not (hasattr(val, 'isNull') and val.isNull()):
-                             collector['original_variants_reservoir'].update(val)
-
-                    if val is None or (hasattr(val, 'isNull') and val.isNull()):
-                        collector['null_count'] += 1
-                    else:
-                        # Value processing
-                        # 1. Always update reservoir (handles switching to sample automatically)
-                        collector['reservoir'].update(val)
-                        
-                        # 2. Check if we exceeded exact limit
-                        if collector['is_exact'] and collector['reservoir'].count_seen > self.MAX_EXACT_VALUES:
-                            collector['is_exact'] = False
-                        
-                        # 3. Numeric Specifics
-                        if meta['object'].isNumeric():
-                            try:
-                                f_val = float(val)
-                                collector['streaming_stats'].update(f_val)
-                            except (ValueError, TypeError):
-                                collector['conversion_errors'] += 1
-                                if len(collector['conversion_error_fids']) < 1000: # Limit error storage
-                                    collector['conversion_error_fids'].append(fid)
-                        
-                        # 4. String Specifics (Non-printable check)
-                        elif meta['type'] == QVariant.String:
-                            if self._has_non_printable_chars(val):
-                                if len(collector['non_printable_fids']) < 1000:
-                                    collector['non_printable_fids'].append(fid)
+                attrs = feature.attributes()
+                chunk_rows.append([attrs[i] for i in attr_indices])
+                chunk_fids.append(feature.id())
 
                 # Validation Check
-                if validation_expressions:
-                    # Context update feature? 
-                    # Simpler to use examine(feature) or evaluate(feature)
-                    # To use prepared expression, we need context.setFeature(feature)
-                    # But context is local to __init__ scope above? No, I defined it in run() logic block.
-                    # Re-creating context here is slow. 
-                    # Let's just use evaluate(feature) for simplicity in this iteration, optimization later if needed.
-                    for i, exp in enumerate(validation_expressions):
+                if validation_evaluators:
+                    set_validation_feature(feature)
+                    outcomes = None
+                    if evaluate_all_rules is not None:
+                        # Expressions report evaluation errors through hasEvalError() rather
+                        # than raising; the except only guards against binding-level failures
                         try:
-                            # Rule passes if True. Fails if False (or 0).
-                            if not exp.evaluate(feature):
+                            outcomes = evaluate_all_rules(validation_context)
+                        except Exception:
+                            outcomes = None
+                        if batch_has_eval_error():
+                            outcomes = None
+                    if type(outcomes) is list and len(outcomes) == rule_count:
+                        # Rule passes if True. Fails if False (or 0).
+                        for i, passed in enumerate(outcomes):
+                            if not passed:
+                                validation_fail_counts[i] += 1
+                    else:
+                        # No combined result: there is no batch (a single rule), or some rule
+                        # hit an evaluation error on this feature. In the latter case the
+                        # feature costs the batch evaluation plus one per rule, so that only
+                        # the failing rules are counted. A rule that cannot be evaluated
+                        # (null result or an exception) counts as failed.
+                        for i, evaluate in validation_evaluators:
+                            try:
+                                if not evaluate(validation_context):
+                                    validation_fail_counts[i] += 1
+                            except Exception:
                                 validation_fail_counts[i] += 1
-                        except:
-                            # If evaluation fails (e.g. type error), count as failure?
-                            validation_fail_counts[i] += 1
-
-                # Correlation Update
-                if self.row_reservoir:
-                    # Extract numeric values for this row
-                    row_vals = []
-                    valid_row = True
-                    for nf_name in self.numeric_fields_for_corr:
-                        # Direct access optimization? No, reusing feature[index] ok
-                        # But we already read it!
-                        # We didn't store it in a local var accessible here easily without re-reading or refactoring loop.
-                        # Refactoring loop slightly to cache current row values mapping
-                        # Actually, let's just re-read using the index. It's fast (in memory variant for feature).
-                        val_n = feature[field_metadata[nf_name]['index']]
-                        try:
-                            # Strict: valid float
-                            if val_n is not None and not (hasattr(val_n, 'isNull') and val_n.isNull()):
-                                row_vals.append(float(val_n))
-                            else:
-                                valid_row = False; break # Skip rows with any nulls for correlation? Or handle NaN?
-                                # Usually correlation ignores incomplete pairs. 
-                                # Simpler to skip row or use NaN. Let's use NaN.
-                                # row_vals.append(float('nan')) 
-                                # But ReservoirSampler stores "items". 
-                        except:
-                            valid_row = False; break
-                    
-                    if valid_row:
-                        self.row_reservoir.update(row_vals)
 
                 count += 1
+                if len(chunk_rows) == self.INGEST_CHUNK_SIZE:
+                    self._ingest_chunk(field_items, collectors, chunk_rows, chunk_fids, check_non_printable)
+                    chunk_rows = []
+                    chunk_fids = []
                 if count % 1000 == 0:
-                     self.setProgress(int((count / total_count) * 100) if total_count > 0 else 0)
-            
+                    # Cancellation is polled with the progress, not on every feature
+                    if self.isCanceled():
+                        return False
+                    # Only signal when the whole percentage actually changes
+                    pct = int((count / total_count) * 100) if total_count > 0 else 0
+                    if pct != last_pct:
+                        self.setProgress(pct)
+                        last_pct = pct
+
+            if chunk_rows:
+                self._ingest_chunk(field_items, collectors, chunk_rows, chunk_fids, check_non_printable)
+
             # 4. Finalize Analysis (Calculate Stats)
             self.setProgress(90)
             for fname, meta in field_metadata.items():
                 if self.isCanceled(): return False
-                
+
                 col = collectors[fname]
                 analyzed_count = count # approximated total analyzed
-                non_null_count = (analyzed_count - col['null_count']) # This might be slightly off if features skipped? No, we iterate all.
-                # Actually count_seen in reservoir matches non_null_count exactly
-                non_null_count = col['reservoir'].count_seen
+                # Numeric reservoirs only see convertible values, so derive this from the null count
+                non_null_count = analyzed_count - col['null_count']
 
                 # Base Results
                 percent_null = (col['null_count'] / analyzed_count * 100) if analyzed_count > 0 else 0
@@ -275,12 +515,14 @@ class FieldProfilerTask(QgsTask):
                     ('% Null', f"{percent_null:.2f}%"),
                     ('Non-Null Count', non_null_count)
                 ])
-                
-                # Copy stored error FIDs to result for selection
-                if col['conversion_error_fids']:
-                    field_res['_conversion_error_fids'] = col['conversion_error_fids']
-                if col['non_printable_fids']:
-                    field_res['_non_printable_fids'] = col['non_printable_fids']
+
+                # Stored error FIDs go to the result as int64 arrays (no copy) for selection
+                if col['conversion_error_fids'].filled:
+                    field_res['_conversion_error_fids'] = col['conversion_error_fids'].ids
+                if col['non_printable_fids'].filled:
+                    field_res['_non_printable_fids'] = col['non_printable_fids'].ids
+                if check_non_printable and meta['type'] == QVariant.String:
+                    field_res['Non-Printable Chars Count'] = col['non_printable_count']
 
                 if not col['is_exact']:
                     field_res['Status (Method)'] = 'Approximated (Large Dataset)'
@@ -299,29 +541,30 @@ class FieldProfilerTask(QgsTask):
                         stats = self._analyze_date(col, non_null_count)
                     else:
                         stats['Status'] = 'Not implemented'
-                    
+
                     field_res.update(stats)
-                    
+
                     # Hints
                     field_res['Data Type Mismatch Hint'] = self._generate_hints(meta, col, field_res)
-                    
+
                 except Exception as e:
                     field_res['Error'] = str(e)
-                
+
                 self.results[fname] = field_res
 
             # Calculate Global Correlation
             if self.row_reservoir: 
-                if self.row_reservoir.reservoir:
+                if self.row_reservoir.filled:
                     try:
-                        # Convert to numpy array (N samples x M fields)
-                        data_matrix = numpy.array(self.row_reservoir.reservoir)
+                        # Sampled rows, N samples x M fields
+                        data_matrix = self.row_reservoir.values
                         if data_matrix.size > 0:
-                            # Rowvar=False because rows are samples, cols are fields
-                            corr_matrix = numpy.corrcoef(data_matrix, rowvar=False)
+                            corr_matrix = _pairwise_corrcoef(data_matrix)
                             self.results['_global_correlation'] = {
                                 'fields': self.numeric_fields_for_corr,
-                                'matrix': corr_matrix.tolist()
+                                'matrix': corr_matrix,  # M x M float64 array
+                                # Two-decimal cell texts, formatted here off the GUI thread
+                                'labels': numpy.char.mod("%.2f", corr_matrix).tolist()
                             }
                         else:
                              self.results['_global_correlation'] = {'Error': 'No valid overlapping numeric data found for correlation.'}
@@ -347,6 +590,57 @@ class FieldProfilerTask(QgsTask):
             QgsMessageLog.logMessage(f"Task Failed: {e}", "FieldProfiler", Qgis.Critical)
             return False
 
+    def _ingest_chunk(self, field_items, collectors, rows, fids, check_non_printable):
+        """
+        Adds a chunk of buffered rows (lists of the analyzed attribute values, in
+        field_items order) with their feature ids to the per-field collectors and
+        to the correlation reservoir.
+        """
+        corr_columns = {}
+        for (fname, meta), values in zip(field_items, zip(*rows)):
+            collector = collectors[fname]
+            if meta['object'].isNumeric():
+                # Only converted floats reach the numeric reservoir
+                floats, nulls, errors = _float_column(values)
+                collector['null_count'] += int(numpy.count_nonzero(nulls))
+                if errors.any():
+                    collector['conversion_errors'] += int(numpy.count_nonzero(errors))
+                    collector['conversion_error_fids'].extend(compress(fids, errors))
+                valid = ~(nulls | errors)
+                valid_floats = floats[valid]
+                collector['streaming_stats'].update_array(valid_floats)
+                collector['reservoir'].update_array(valid_floats)
+                corr_columns[fname] = (floats, valid)
+            else:
+                non_null = _non_null_values(values)
+                collector['null_count'] += len(values) - len(non_null)
+                # Reservoir handles switching to sample automatically
+                collector['reservoir'].update_many(non_null)
+                # Store original QVariant for dates (using reservoir if needed)
+                if collector['original_variants_reservoir'] is not None:
+                    collector['original_variants_reservoir'].update_many(non_null)
+                # String Specifics (Non-printable check)
+                if check_non_printable and meta['type'] == QVariant.String:
+                    # Nulls are never str, so the check itself already rejects them
+                    flags = list(map(self._has_non_printable_chars, values))
+                    flagged = flags.count(True)
+                    if flagged:
+                        collector['non_printable_count'] += flagged
+                        collector['non_printable_fids'].extend(compress(fids, flags))
+
+            # Check if we exceeded exact limit
+            if collector['is_exact'] and collector['reservoir'].count_seen > self.MAX_EXACT_VALUES:
+                collector['is_exact'] = False
+
+        # Correlation Update: nulls/unconvertible values are NaN and are dropped
+        # pair-by-pair when the matrix is computed; a row only contributes if it
+        # has at least one complete pair
+        if self.row_reservoir:
+            corr = [corr_columns[nf_name] for nf_name in self.numeric_fields_for_corr]
+            matrix = numpy.column_stack([floats for floats, _ in corr])
+            valid_per_row = numpy.sum([valid for _, valid in corr], axis=0)
+            self.row_reservoir.update_array(matrix[valid_per_row > 1])
+
     def finished(self, result):
         """
         Called on main thread when task finishes.
@@ -363,7 +657,7 @@ class FieldProfilerTask(QgsTask):
     def _analyze_numeric(self, col, meta, count):
         res = OrderedDict()
         res['Conversion Errors'] = col['conversion_errors']
-        
+
         # Use Streaming Stats for basic stuff
         ss = col['streaming_stats']
         res['Min'] = ss.min_val if ss.count > 0 else float('nan')
@@ -373,66 +667,112 @@ class FieldProfilerTask(QgsTask):
         res['Sum'] = ss.mean * ss.count # inferred sum
         res['Stdev (pop)'] = ss.std_dev()
         res['CV %'] = (ss.std_dev() / ss.mean * 100) if ss.mean != 0 else float('nan')
-        
-        # Use Reservoir for advanced stats (Mode, Median, Quantiles)
-        data_sample = numpy.array([float(x) for x in col['reservoir'].reservoir if x is not None], dtype=float)
-        # Filter NaNs/Infs ??
+
+        # The reservoir already holds a float64 array; everything below is a vectorized
+        # reduction over that one buffer.
+        data_sample = col['reservoir'].values
         data_sample = data_sample[~numpy.isnan(data_sample)]
-        
-        # Mode
+        sample_size = len(data_sample)
+        # Sorted once; distinct values, quantiles, outliers and bins all read from it
+        sorted_sample = numpy.sort(data_sample)
+
+        # Mode(s) and distinct count from the runs of equal values in the sorted sample
         modes_val = 'N/A'
-        if len(data_sample) > 0:
-             # Basic mode on sample
-             if SCIPY_AVAILABLE:
-                 m = scipy_stats.mode(data_sample, nan_policy='omit')
-                 modes_val = m.mode if m.mode.size > 0 else 'N/A'
-             else:
-                 try: 
-                     modes_val = statistics.multimode(data_sample.tolist())
-                 except: modes_val = 'N/A'
+        if sample_size > 0:
+            run_starts = numpy.concatenate(([0], numpy.flatnonzero(sorted_sample[1:] != sorted_sample[:-1]) + 1))
+            uniq = sorted_sample[run_starts]
+            uniq_counts = numpy.diff(numpy.append(run_starts, sample_size))
+            n_modes = numpy.count_nonzero(uniq_counts == uniq_counts.max())
+            modes = _top_k(uniq, uniq_counts, min(n_modes, self.config_options.get('limit_unique', 5)))
+            modes_val = [v for v, c in modes]
+            res['Variety (distinct)'] = uniq.size if col['is_exact'] else f"{uniq.size} (Sample)"
         res['Mode(s)'] = modes_val
-        
-        # Quantiles
-        res['Median'] = numpy.median(data_sample) if len(data_sample) > 0 else float('nan')
-        if len(data_sample) > 0:
-            res['Q1'] = numpy.percentile(data_sample, 25)
-            res['Q3'] = numpy.percentile(data_sample, 75)
-            res['IQR'] = res['Q3'] - res['Q1']
-            
-            # Outliers on sample
-            lower = res['Q1'] - 1.5*res['IQR']
-            upper = res['Q3'] + 1.5*res['IQR']
-            outliers = data_sample[(data_sample < lower) | (data_sample > upper)]
-            res['Outliers (IQR)'] = len(outliers)
-            # Extrapolate outlier count if sampled? 
-            # If is_exact=True, count is exact. If is_exact=False, this is sample count.
-            if not col['is_exact']:
-                # Roughly extrapolate
-                factor = count / len(data_sample)
-                res['Outliers (IQR)'] = f"{int(len(outliers) * factor)} (Est.)"
-            
-            res['Min Outlier'] = numpy.min(outliers) if len(outliers) > 0 else 'N/A'
-            res['Max Outlier'] = numpy.max(outliers) if len(outliers) > 0 else 'N/A'
-            res['% Outliers'] = (len(outliers)/len(data_sample) * 100) if len(data_sample)>0 else 0
-        
-        # Advanced options (Skew, Kurtosis) on sample
-        if self.config_options.get('numeric_dist_shape') and SCIPY_AVAILABLE and len(data_sample) > 0:
-            res['Skewness'] = scipy_stats.skew(data_sample)
-            res['Kurtosis'] = scipy_stats.kurtosis(data_sample)
-            if len(data_sample) >= 3 and len(data_sample) < 5000: # Shapiro is slow/valid for small n
-                s, p = scipy_stats.shapiro(data_sample)
-                res['Normality (Shapiro-Wilk p)'] = p
+
+        if sample_size > 0:
+            # Sign and integer counts in one pass (numba kernel when available)
+            zero_count, pos_count, neg_count, int_count = numeric_value_counts(data_sample)
+            res['Zeros'] = self._estimate(zero_count, col, ss.count, sample_size)
+            res['Positives'] = self._estimate(pos_count, col, ss.count, sample_size)
+            res['Negatives'] = self._estimate(neg_count, col, ss.count, sample_size)
+
+            if self.config_options.get('numeric_int_decimal'):
+                res['Integer Values'] = self._estimate(int_count, col, ss.count, sample_size)
+                res['Decimal Values'] = self._estimate(sample_size - int_count, col, ss.count, sample_size)
+                res['% Integer Values'] = int_count / sample_size * 100
+
+        # Quantiles: every order statistic we report, read from the sorted sample
+        res['Median'] = float('nan')
+        if sample_size > 0:
+            p1, p5, q1, median, q3, p95, p99 = _quantiles_from_sorted(sorted_sample, self.QUANTILE_LEVELS).tolist()
+            res['Median'] = median
+            res['Q1'] = q1
+            res['Q3'] = q3
+            res['IQR'] = q3 - q1
+            if self.config_options.get('numeric_adv_percentiles'):
+                res['1st Pctl'] = p1
+                res['5th Pctl'] = p5
+                res['95th Pctl'] = p95
+                res['99th Pctl'] = p99
+
+            if self.config_options.get('numeric_adv_percentiles'):
+                # Freedman-Diaconis: bin width 2*IQR/n^(1/3) over the sample range
+                data_range = sorted_sample[-1] - sorted_sample[0]
+                if res['IQR'] > 0 and numpy.isfinite(data_range):
+                    bin_width = 2 * res['IQR'] / sample_size ** (1 / 3)
+                    res['Optimal Bins (Freedman-Diaconis)'] = max(1, int(numpy.ceil(data_range / bin_width)))
+                else:
+                    res['Optimal Bins (Freedman-Diaconis)'] = "N/A (IQR=0)" if res['IQR'] == 0 else "N/A"
+
+            # Outliers on sample: the tails below/above the IQR fences are contiguous
+            # in the sorted sample, so two binary searches count them
+            lower = q1 - 1.5 * res['IQR']
+            upper = q3 + 1.5 * res['IQR']
+            n_low = int(numpy.searchsorted(sorted_sample, lower, side='left'))
+            n_high = sample_size - int(numpy.searchsorted(sorted_sample, upper, side='right'))
+            outlier_count = n_low + n_high
+            # Exact count if is_exact, otherwise extrapolated from the sample
+            res['Outliers (IQR)'] = self._estimate(outlier_count, col, ss.count, sample_size)
+
+            if self.config_options.get('numeric_outlier_details'):
+                if outlier_count > 0:
+                    res['Min Outlier'] = sorted_sample[0] if n_low else sorted_sample[sample_size - n_high]
+                    res['Max Outlier'] = sorted_sample[-1] if n_high else sorted_sample[n_low - 1]
+                else:
+                    res['Min Outlier'] = 'N/A'
+                    res['Max Outlier'] = 'N/A'
+                res['% Outliers'] = outlier_count / sample_size * 100
+
+        # Advanced options (Skew, Kurtosis, Normality) on the same sample array
+        if self.config_options.get('numeric_dist_shape'):
+            if not SCIPY_AVAILABLE:
+                res['Skewness'] = res['Kurtosis'] = res['Normality (Shapiro-Wilk p)'] = "N/A (Scipy not found)"
+            elif sample_size < 3:
+                res['Skewness'] = res['Kurtosis'] = res['Normality (Shapiro-Wilk p)'] = "N/A (<3 valid)"
             else:
-                res['Normality (Shapiro-Wilk p)'] = "N/A (N>5000)"
+                res['Skewness'] = scipy_stats.skew(data_sample, bias=False)
+                res['Kurtosis'] = scipy_stats.kurtosis(data_sample, bias=False)
+                if sample_size <= 5000: # Shapiro is slow/valid for small n
+                    p = scipy_stats.shapiro(data_sample)[1]
+                    res['Normality (Shapiro-Wilk p)'] = p
+                else:
+                    # D'Agostino-Pearson K² is linear in n and suited to large samples
+                    res['Normality (Shapiro-Wilk p)'] = "N/A (N>5000)"
+                    p = scipy_stats.normaltest(data_sample)[1]
+                    res['Normality (K² p)'] = p
+                res['Normality (Likely Normal)'] = bool(p > 0.05)
 
         # Histogram data for charts
         if len(data_sample) > 0:
             try:
-                # Filter Infs as well
-                data_clean = data_sample[~numpy.isinf(data_sample)]
+                # Filter Infs as well (they sit at both ends of the sorted sample)
+                data_clean = sorted_sample[numpy.searchsorted(sorted_sample, -numpy.inf, side='right'):
+                                           numpy.searchsorted(sorted_sample, numpy.inf, side='left')]
                 if len(data_clean) > 0:
-                    hist, bin_edges = numpy.histogram(data_clean, bins='auto')
-                    res['_histogram_data'] = (hist.tolist(), bin_edges.tolist())
+                    hist, bin_edges = _histogram_from_sorted(data_clean)
+                    # Kept as float64 arrays with the bar widths precomputed, so the chart draws without copying
+                    bin_edges = numpy.ascontiguousarray(bin_edges, dtype=numpy.float64)
+                    res['_histogram_data'] = (numpy.ascontiguousarray(hist, dtype=numpy.float64), bin_edges,
+                                              numpy.diff(bin_edges))
                 else:
                      QgsMessageLog.logMessage(f"Histogram skipped: All values are Inf or NaN", "FieldProfiler", Qgis.Warning)
             except Exception as e:
@@ -441,146 +781,227 @@ class FieldProfilerTask(QgsTask):
 
         return res
 
+    def _estimate(self, n, col, count, sample_size):
+        """Return n as-is for exact runs, otherwise scaled from the sample to the full count."""
+        if col['is_exact']:
+            return int(n)
+        return f"{int(n * count / sample_size)} (Est.)"
+
     def _analyze_text(self, col, count):
         res = OrderedDict()
         sample = col['reservoir'].reservoir
-        # Convert all to string
-        str_sample = [str(x) for x in sample]
-        
-        # Approx stats on sample
-        empty_count = str_sample.count('') # This is only on sample!
-        
-        # If sampling, we can't give exact Empty String count unless we tracked it separately in streaming
-        # For simplicity, assuming sample is representative.
-        
+        # Distinct values are counted by hashing in Counter's C loop and only the distinct
+        # values are sorted; an object-array numpy.unique would sort the whole sample with
+        # Python-level comparisons.
+        value_counts = Counter(map(str, sample))
+        values = sorted(value_counts)
+        n_distinct = len(values)
+        uniq = numpy.array(values, dtype=object)
+        weights = numpy.fromiter(map(value_counts.__getitem__, values), dtype=numpy.int64, count=n_distinct)
+
+        # Per-value text properties are computed once per distinct value (C-level map over
+        # str methods into NumPy arrays) and weighted by how often each value occurs.
+        # All counts are on the sample; if sampling, they are scaled to the full count.
+        lengths = numpy.fromiter(map(len, values), dtype=numpy.int64, count=n_distinct)
+        stripped_lengths = numpy.fromiter(map(len, map(str.strip, values)), dtype=numpy.int64, count=n_distinct)
+
+        empty_mask = lengths == 0
+        empty_count = int(weights[empty_mask].sum())
         res['Empty Strings'] = empty_count if col['is_exact'] else f"{int(empty_count * count / len(sample))} (Est.)"
-        
+        res['% Empty'] = f"{empty_count / len(sample) * 100:.2f}%"
+
+        # Same rule as the selection expression: differs from trim() and is not blank
+        padded = int(weights[(stripped_lengths != lengths) & (stripped_lengths > 0)].sum())
+        res['Leading/Trailing Spaces'] = padded if col['is_exact'] else f"{int(padded * count / len(sample))} (Est.)"
+
         # Lengths
-        non_empty = [s for s in str_sample if s]
-        if non_empty:
-            lengths = [len(s) for s in non_empty]
-            res['Min Length'] = min(lengths)
-            res['Max Length'] = max(lengths)
-            res['Avg Length'] = sum(lengths)/len(lengths)
-        
-        # Top Values
-        ctr = Counter(str_sample)
-        top = ctr.most_common(self.config_options.get('limit_unique', 5))
-        top_str = []
-        for v, c in top:
-            actual_c = c if col['is_exact'] else int(c * count / len(sample))
-            top_str.append(f"'{v}': {actual_c}")
-        res['Unique Values (Top)'] = "\n".join(top_str)
+        non_empty = ~empty_mask
+        non_empty_total = int(weights[non_empty].sum())
+        if non_empty_total:
+            res['Min Length'] = int(lengths[non_empty].min())
+            res['Max Length'] = int(lengths[non_empty].max())
+            res['Avg Length'] = float((lengths * weights).sum() / non_empty_total)
+
+        if self.config_options.get('text_case_analysis') and non_empty_total:
+            upper = numpy.fromiter(map(str.isupper, values), dtype=bool, count=n_distinct)
+            lower = numpy.fromiter(map(str.islower, values), dtype=bool, count=n_distinct)
+            title = numpy.fromiter(map(str.istitle, values), dtype=bool, count=n_distinct) & ~upper
+            has_cased = numpy.fromiter(map(operator.ne, values, map(str.swapcase, values)), dtype=bool, count=n_distinct)
+            mixed = has_cased & ~(upper | lower | title)
+            res['% Uppercase'] = float(weights[upper].sum() / non_empty_total * 100)
+            res['% Lowercase'] = float(weights[lower].sum() / non_empty_total * 100)
+            res['% Titlecase'] = float(weights[title].sum() / non_empty_total * 100)
+            res['% Mixed Case'] = float(weights[mixed].sum() / non_empty_total * 100)
+
+        # Pattern checks run once per distinct value and are weighted by its count
+        pattern_counts = []
+        for name, pattern in TEXT_PATTERNS.items():
+            matched = sum(c for v, c in zip(values, weights.tolist()) if pattern.fullmatch(v))
+            if matched:
+                actual_m = matched if col['is_exact'] else int(matched * count / len(sample))
+                pattern_counts.append(f"{name}: {actual_m}")
+        res['Pattern Matches'] = ", ".join(pattern_counts) if pattern_counts else "None"
+
+        if self.config_options.get('text_case_analysis'):
+            multi_space = sum(c for v, c in zip(values, weights.tolist()) if MULTIPLE_SPACES_RE.search(v))
+            res['Internal Multiple Spaces'] = multi_space if col['is_exact'] else f"{int(multi_space * count / len(sample))} (Est.)"
+
+        res['Variety (distinct)'] = n_distinct if col['is_exact'] else f"{n_distinct} (Sample)"
+        if self.config_options.get('text_rarity_nonprintable'):
+            once = int(numpy.count_nonzero(weights == 1))
+            res['Values Occurring Once'] = once if col['is_exact'] else f"{once} (Sample)"
+
+        top = _top_k(uniq, weights, self.config_options.get('limit_unique', 5))
+        top_counts = [c if col['is_exact'] else int(c * count / len(sample)) for _, c in top]
+        res['Unique Values (Top)'] = "\n".join(f"'{v}': {actual_c}" for (v, _), actual_c in zip(top, top_counts))
         if top:
             res['Unique Values (Top)_actual_first_value'] = top[0][0]
-        
+
         # Raw top values for charts
-        res['_top_values_raw'] = []
-        for v, c in top:
-            actual_c = c if col['is_exact'] else int(c * count / len(sample))
-            res['_top_values_raw'].append( (str(v), actual_c) )
+        res['_top_values_raw'] = [(str(v), actual_c) for (v, _), actual_c in zip(top, top_counts)]
+        # Bar labels and heights, split once here instead of on every chart redraw
+        res['_top_values_chart'] = (tuple(v[:15] for v, _ in res['_top_values_raw']), tuple(top_counts))
 
         return res
 
     def _analyze_date(self, col, count):
-        from collections import Counter
-        from datetime import datetime
-        
         res = OrderedDict()
         sample = col['original_variants_reservoir'].reservoir
-        
+
         if not sample:
             return {'Status': 'No data'}
-        
-        # Convert samples to Python datetime for analysis
-        py_datetimes = []
-        q_date_time_objects = []
-        
-        for val in sample:
-            if val is None:
-                continue
-            
-            py_dt = None
-            q_obj = None
-            
-            if isinstance(val, QDateTime) and val.isValid():
-                py_dt = val.toPyDateTime()
-                q_obj = val
-            elif isinstance(val, QDate) and val.isValid():
-                py_dt = datetime(val.year(), val.month(), val.day())
-                q_obj = val
-            
-            if py_dt and q_obj:
-                py_datetimes.append(py_dt)
-                q_date_time_objects.append(q_obj)
-        
-        if not py_datetimes:
+
+        # Valid QDate/QDateTime values; their order is kept so unique values can map
+        # back to the first original object
+        q_date_time_objects = [val for val in sample if isinstance(val, (QDate, QDateTime)) and val.isValid()]
+
+        if not q_date_time_objects:
             return {'Status': 'No valid date objects parsed'}
-        
-        # Min/Max Date
-        min_d = min(py_datetimes)
-        max_d = max(py_datetimes)
+
+        # One datetime64 array; every calendar/time component below is an integer
+        # reduction over it rather than a method call per value.
         is_datetime_field = any(isinstance(q, QDateTime) for q in q_date_time_objects)
-        
+        if is_datetime_field:
+            stamps = numpy.array([q.toPyDateTime() if isinstance(q, QDateTime) else datetime(q.year(), q.month(), q.day())
+                                  for q in q_date_time_objects], dtype='datetime64[s]')
+        else:
+            # Plain dates: Julian day numbers are days since 1970-01-01 (JD 2440588) after
+            # one subtraction, so no Python datetime is built per value
+            julian_days = numpy.fromiter((q.toJulianDay() for q in q_date_time_objects), dtype=numpy.int64, count=len(q_date_time_objects))
+            stamps = (julian_days - 2440588).astype('datetime64[D]').astype('datetime64[s]')
+        days = stamps.astype('datetime64[D]')
+
+        # Min/Max Date
+        min_d = stamps.min().astype(datetime)
+        max_d = stamps.max().astype(datetime)
         if is_datetime_field:
             res['Min Date'] = min_d.isoformat(sep=' ', timespec='seconds')
             res['Max Date'] = max_d.isoformat(sep=' ', timespec='seconds')
         else:
             res['Min Date'] = min_d.date().isoformat()
             res['Max Date'] = max_d.date().isoformat()
-        
+
         # Common Years, Months, Days
-        years = [d.year for d in py_datetimes]
-        months = [d.month for d in py_datetimes]
-        days_of_week = [d.weekday() for d in py_datetimes]  # Monday=0, Sunday=6
-        
+        years = days.astype('datetime64[Y]').astype(numpy.int64) + 1970
+        months = days.astype('datetime64[M]').astype(numpy.int64) % 12 + 1
+        days_of_week = (days.astype(numpy.int64) + 3) % 7  # 1970-01-01 was a Thursday; Monday=0, Sunday=6
+
         day_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
         month_names = ["", "Jan", "Feb", "Mar", "Apr", "May", "Jun", 
                        "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-        
-        res['Common Years'] = ", ".join([f"{yr}:{cnt}" for yr, cnt in Counter(years).most_common(3)])
-        res['Common Months'] = ", ".join([f"{month_names[mo]}:{cnt}" for mo, cnt in Counter(months).most_common(3)])
-        res['Common Days'] = ", ".join([f"{day_names[d]}:{cnt}" for d, cnt in Counter(days_of_week).most_common(3)])
-        
+
+        res['Common Years'] = ", ".join([f"{yr}:{cnt}" for yr, cnt in _top_k(*numpy.unique(years, return_counts=True), 3)])
+        res['Common Months'] = ", ".join([f"{month_names[mo]}:{cnt}" for mo, cnt in _top_k(*numpy.unique(months, return_counts=True), 3)])
+        res['Common Days'] = ", ".join([f"{day_names[d]}:{cnt}" for d, cnt in _top_k(*numpy.unique(days_of_week, return_counts=True), 3)])
+
         # Dates Before/After Today
-        today = datetime.now().date()
-        res['Dates Before Today'] = sum(1 for d in py_datetimes if d.date() < today)
-        res['Dates After Today'] = sum(1 for d in py_datetimes if d.date() > today)
-        
-        # Weekend/Weekday analysis
-        weekend_count = sum(1 for d in days_of_week if d >= 5)  # Sat=5, Sun=6
-        total = len(py_datetimes)
-        res['% Weekend Dates'] = f"{weekend_count / total * 100:.2f}%"
-        res['% Weekday Dates'] = f"{(total - weekend_count) / total * 100:.2f}%"
-        
-        # Top unique values
+        today = numpy.datetime64(datetime.now().date(), 'D')
+        res['Dates Before Today'] = int(numpy.count_nonzero(days < today))
+        res['Dates After Today'] = int(numpy.count_nonzero(days > today))
+
+        total = len(q_date_time_objects)
+        if self.config_options.get('date_time_weekend'):
+            # Time components only mean something for DateTime fields
+            if is_datetime_field:
+                seconds_of_day = (stamps - days).astype(numpy.int64)
+                hours = seconds_of_day // 3600
+                res['Common Hours (Top 3)'] = ", ".join([f"{h:02d}h:{cnt}" for h, cnt in _top_k(*numpy.unique(hours, return_counts=True), 3)])
+                res['% Midnight Time'] = f"{numpy.count_nonzero(seconds_of_day == 0) / total * 100:.2f}%"
+                res['% Noon Time'] = f"{numpy.count_nonzero(seconds_of_day == 12 * 3600) / total * 100:.2f}%"
+
+            # Weekend/Weekday analysis
+            weekend_count = int(numpy.count_nonzero(days_of_week >= 5))  # Sat=5, Sun=6
+            res['% Weekend Dates'] = f"{weekend_count / total * 100:.2f}%"
+            res['% Weekday Dates'] = f"{(total - weekend_count) / total * 100:.2f}%"
+
+        # Top unique values; the first QDate/QDateTime seen for each value is kept
+        # for display and for feature selection
         limit = self.config_options.get('limit_unique', 5)
-        date_counts = Counter(q_date_time_objects)
-        sorted_dates = sorted(date_counts.items(), key=lambda x: (-x[1], str(x[0])))
-        
+        uniq, first_idx, uniq_counts = numpy.unique(stamps, return_index=True, return_counts=True)
+        top = [(q_date_time_objects[first_idx[i]], cnt) for i, cnt in _top_k(numpy.arange(uniq.size), uniq_counts, limit)]
+
         top_str = []
-        for i, (date_obj, cnt) in enumerate(sorted_dates):
-            if i >= limit:
-                break
+        for date_obj, cnt in top:
             if isinstance(date_obj, QDateTime):
                 display = date_obj.toString("yyyy-MM-dd HH:mm:ss")
             else:
                 display = date_obj.toString("yyyy-MM-dd")
             actual_cnt = cnt if col['is_exact'] else int(cnt * count / len(sample))
             top_str.append(f"'{display}': {actual_cnt}")
-        
+
         res['Unique Values (Top)'] = "\n".join(top_str) if top_str else "N/A"
-        if sorted_dates:
-            res['Unique Values (Top)_actual_first_value'] = sorted_dates[0][0]
-        
+        if top:
+            res['Unique Values (Top)_actual_first_value'] = top[0][0]
+
         return res
 
 
     def _has_non_printable_chars(self, text_value):
-        if not isinstance(text_value, str): return False
-        allowed_control = {'\t', '\n', '\r'} 
-        return any(not c.isprintable() and c not in allowed_control for c in text_value)
+        if not isinstance(text_value, str) or text_value.isprintable(): return False
+        # Something failed the check; it only counts if it is not one of the allowed controls
+        return not text_value.translate(ALLOWED_CONTROL_CHARS_DELETE).isprintable()
 
     def _generate_hints(self, meta, col, res):
         # ... logic copied from original ...
         return "N/A"
+
+
+class CsvExportTask(QgsTask):
+    """
+    Background task writing an already formatted results table to a CSV file,
+    so slow disks do not block the QGIS interface.
+    """
+    # Emitted on the main thread with (success, file path or error message)
+    exportFinished = pyqtSignal(bool, str)
+
+    def __init__(self, file_path, headers, rows):
+        """
+        headers is the header row and rows a list of rows, each a list of cell texts;
+        both are fully materialized on the main thread before the task starts.
+        """
+        super().__init__(f"Exporting field profile to {os.path.basename(file_path)}", QgsTask.CanCancel)
+        self.file_path = file_path
+        self.headers = headers
+        self.rows = rows
+        self.exception = None
+
+    def run(self):
+        try:
+            with open(self.file_path, 'w', buffering=1 << 20, newline='', encoding='utf-8-sig') as csvfile:
+                writer = csv.writer(csvfile, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+                writer.writerow(self.headers)
+                writer.writerows(self.rows)
+            return True
+        except Exception as e:
+            self.exception = e
+            QgsMessageLog.logMessage(f"CSV export failed: {e}", "FieldProfiler", Qgis.Critical)
+            return False
+
+    def finished(self, result):
+        """
+        Called on main thread when task finishes.
+        """
+        if result:
+            self.exportFinished.emit(True, self.file_path)
+        else:
+            self.exportFinished.emit(False, str(self.exception) if self.exception else "Export cancelled.")
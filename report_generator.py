@@ -1,5 +1,70 @@
 # -*- coding: utf-8 -*-
-import datetime
+import io
+import time
+from functools import lru_cache
+from itertools import chain
+
+import numpy
+
+# Document head up to the report title block, filled in with str.format
+# (CSS braces are doubled)
+_HEAD_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<title>Field Profile: {layer_name}</title>
+<style>
+body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 20px; color: #333; }}
+h1 {{ color: #2c3e50; }}
+h2 {{ color: #34495e; margin-top: 30px; }}
+table {{ border-collapse: collapse; width: 100%; margin-bottom: 20px; font-size: 14px; }}
+th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
+th {{ background-color: #f2f2f2; color: #333; font-weight: bold; }}
+tr:nth-child(even) {{ background-color: #f9f9f9; }}
+tr:hover {{ background-color: #f1f1f1; }}
+.stat-name {{ font-weight: bold; color: #555; }}
+.numeric {{ text-align: right; }}
+.quality-issue {{ color: #d35400; font-weight: bold; }}
+.section-info {{ background-color: #e8f6f3; padding: 10px; border-radius: 5px; border-left: 5px solid #1abc9c; }}
+.heatmap-cell {{ text-align: center; }}
+</style>
+</head>
+<body>
+<h1>Field Profile Report</h1>
+<div class='section-info'><p><strong>Layer:</strong> {layer_name}<br><strong>Generated:</strong> {timestamp}</p></div>"""
+
+# Statistics listed first in the report table, in this order; the rest follow alphabetically
+_LEADING_STATS = ('Status', 'Non-Null Count', 'Null Count', '% Null', 'Min', 'Max', 'Mean', 'Median', 'Mode(s)')
+_LEADING_STAT_SET = frozenset(_LEADING_STATS)
+
+def _heatmap_cell_openings():
+    backgrounds = (["#ffffff"]
+                   + [f"rgb({i}, {i}, 255)" for i in range(256)]
+                   + [f"rgb(255, {i}, {i})" for i in range(256)])
+    return [f"<td class='heatmap-cell' style='background-color: {bg}; color: {fg}'>"
+            for fg in ("#000000", "#ffffff") for bg in backgrounds]
+
+# Correlation cell opening tags: index 0 white, 1 + i blue and 257 + i red background
+# of intensity i, plus 513 for the light text colour
+_HEATMAP_CELL_OPENINGS = _heatmap_cell_openings()
+
+def _heatmap_cell_indices(matrix):
+    """Index into _HEATMAP_CELL_OPENINGS for every cell of a 2-D float64 correlation matrix."""
+    with numpy.errstate(invalid='ignore'):
+        intensity = (255 * (1 - numpy.abs(numpy.nan_to_num(matrix)))).astype(numpy.int64)
+        return (numpy.where(matrix > 0, 1 + intensity, numpy.where(matrix < 0, 257 + intensity, 0))
+                + numpy.where(numpy.abs(matrix) > 0.6, 513, 0))
+
+# Characters replaced when layer, field and statistic names or values are put into the HTML
+_HTML_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
+@lru_cache(maxsize=None)
+def _cell_class(value_type):
+    """CSS class of a statistics cell holding a value of type value_type."""
+    return "numeric" if issubclass(value_type, (int, float)) else ""
+
+def _esc(value):
+    """value as text safe to place in HTML element content."""
+    return (value if isinstance(value, str) else str(value)).translate(_HTML_ESCAPE)
 
 class ReportGenerator:
     """
@@ -7,98 +72,95 @@ class ReportGenerator:
     """
     def __init__(self, layer_name):
         self.layer_name = layer_name
-        self.timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     def generate_report(self, results, correlation_matrix=None):
         """
         results: OrderedDict of field results
         correlation_matrix: Dict with 'fields' and 'matrix' (optional)
         """
-        html = [
-            "<!DOCTYPE html>",
-            "<html>",
-            "<head>",
-            f"<title>Field Profile: {self.layer_name}</title>",
-            "<style>",
-            "body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 20px; color: #333; }",
-            "h1 { color: #2c3e50; }",
-            "h2 { color: #34495e; margin-top: 30px; }",
-            "table { border-collapse: collapse; width: 100%; margin-bottom: 20px; font-size: 14px; }",
-            "th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }",
-            "th { background-color: #f2f2f2; color: #333; font-weight: bold; }",
-            "tr:nth-child(even) { background-color: #f9f9f9; }",
-            "tr:hover { background-color: #f1f1f1; }",
-            ".stat-name { font-weight: bold; color: #555; }",
-            ".numeric { text-align: right; }",
-            ".quality-issue { color: #d35400; font-weight: bold; }",
-            ".section-info { background-color: #e8f6f3; padding: 10px; border-radius: 5px; border-left: 5px solid #1abc9c; }",
-            ".heatmap-cell { text-align: center; }",
-            "</style>",
-            "</head>",
-            "<body>",
-            f"<h1>Field Profile Report</h1>",
-            f"<div class='section-info'><p><strong>Layer:</strong> {self.layer_name}<br><strong>Generated:</strong> {self.timestamp}</p></div>",
-            "<h2>Field Statistics</h2>",
-            "<table>",
-            "<thead><tr><th>Statistic</th>"
-        ]
-
-        # Table Header
-        field_names = list(results.keys())
-        for fname in field_names:
-            html.append(f"<th>{fname}</th>")
-        html.append("</tr></thead><tbody>")
-
-        # Determine all unique stats
-        all_stats = set()
-        for res in results.values():
-            all_stats.update(res.keys())
-        
-        # Sort stats (reuse roughly the logic from dockwidget if possible, or simple sort)
-        # For simple report, alphabetical + some forced order is fine.
-        start_stats = ['Status', 'Non-Null Count', 'Null Count', '% Null', 'Min', 'Max', 'Mean', 'Median', 'Mode(s)']
-        sorted_stats = [s for s in start_stats if s in all_stats]
-        sorted_stats.extend(sorted([s for s in all_stats if s not in start_stats and not s.startswith('_')])) # Skip internal keys
-
-        for stat in sorted_stats:
-            html.append(f"<tr><td class='stat-name'>{stat}</td>")
-            for fname in field_names:
-                val = results[fname].get(stat, "")
-                # Simple formatting
-                str_val = str(val)
-                cls = "numeric" if isinstance(val, (int, float)) else ""
-                html.append(f"<td class='{cls}'>{str_val}</td>")
-            html.append("</tr>")
-        
-        html.append("</tbody></table>")
+        # Written into one growing C buffer instead of a list joined at the end
+        buf = io.StringIO()
+        self._write_report(results, correlation_matrix, buf.write)
+        return buf.getvalue()
+
+    def write_report(self, fh, results, correlation_matrix=None):
+        """
+        Writes the report line by line to the text file-like object fh, without
+        holding the whole document in memory. Open files with a generous buffer
+        (e.g. buffering=1 << 20) so the many small writes are batched.
+        """
+        self._write_report(results, correlation_matrix, fh.write)
+
+    def _write_report(self, results, correlation_matrix, out):
+        for line in self._report_lines(results, correlation_matrix):
+            out(line)
+            out("\n")
+
+    def _report_lines(self, results, correlation_matrix):
+        """Yields the report's HTML one line at a time."""
+        yield _HEAD_TEMPLATE.format(layer_name=_esc(self.layer_name), timestamp=time.strftime("%Y-%m-%d %H:%M:%S"))
+
+        # Fields whose analysis failed only get a one-line stub; keeping them out of
+        # the statistics table saves a column of empty cells on every stat row
+        error_fields = [(fname, res['Error']) for fname, res in results.items() if 'Error' in res]
+        field_names = [fname for fname, res in results.items() if 'Error' not in res]
+
+        if field_names:
+            yield from ("<h2>Field Statistics</h2>", "<table>")
+            # Table Header, one line
+            header_cells = "</th><th>".join(map(_esc, field_names))
+            yield f"<thead><tr><th>Statistic</th><th>{header_cells}</th></tr></thead><tbody>"
+
+            # Determine all unique stats in one pass over the fields' keys
+            field_results = [results[fname] for fname in field_names]
+            all_stats = dict.fromkeys(chain.from_iterable(field_results))
+
+            # Sort stats: a few key ones first, the rest alphabetically
+            sorted_stats = [s for s in _LEADING_STATS if s in all_stats]
+            sorted_stats.extend(sorted(s for s in all_stats if s not in _LEADING_STAT_SET and not s.startswith('_'))) # Skip internal keys
+
+            # Each statistic row is assembled and emitted as one string. The cell class is
+            # resolved per value type, and usually a row has one class for all its cells.
+            for stat in sorted_stats:
+                values = [res.get(stat, "") for res in field_results]
+                row_classes = {_cell_class(value_type) for value_type in set(map(type, values))}
+                if len(row_classes) == 1:
+                    # One template-style fused join: the cell boundary is the only separator
+                    cell_class = row_classes.pop()
+                    cell_open = f"<td class='{cell_class}'>"
+                    # Numbers never render markup characters, so they skip the escape pass
+                    texts = map(str, values) if cell_class == "numeric" else map(_esc, values)
+                    cells = cell_open + f"</td>{cell_open}".join(texts) + "</td>"
+                else:
+                    cells = "".join(f"<td class='{_cell_class(type(val))}'>{_esc(val)}</td>" for val in values)
+                yield f"<tr><td class='stat-name'>{_esc(stat)}</td>{cells}</tr>"
+
+            yield "</tbody></table>"
+
+        if error_fields:
+            yield "<h2>Fields With Errors</h2>"
+            yield "<table><thead><tr><th>Field</th><th>Error</th></tr></thead><tbody>"
+            for fname, error in error_fields:
+                yield f"<tr><td class='stat-name'>{_esc(fname)}</td><td class='quality-issue'>{_esc(error)}</td></tr>"
+            yield "</tbody></table>"
 
         # Correlation Matrix
         if correlation_matrix and 'fields' in correlation_matrix:
             c_fields = correlation_matrix['fields']
             matrix = correlation_matrix['matrix']
-            html.append("<h2>Correlation Matrix</h2>")
-            html.append("<table><thead><tr><th></th>")
-            for f in c_fields: html.append(f"<th>{f}</th>")
-            html.append("</tr></thead><tbody>")
+            labels = correlation_matrix.get('labels')
+            yield "<h2>Correlation Matrix</h2>"
+            header_cells = "".join(f"<th>{_esc(f)}</th>" for f in c_fields)
+            yield f"<table><thead><tr><th></th>{header_cells}</tr></thead><tbody>"
             
+            # Opening tag of every cell picked in one vectorized pass: white for r = 0 (and
+            # NaN), else blue (positive) or red (negative) fading with |r|; light text above 0.6
+            m = numpy.asarray(matrix, dtype=numpy.float64)
+            opening_idx = _heatmap_cell_indices(m)
             for i, row_f in enumerate(c_fields):
-                html.append(f"<tr><td class='stat-name'>{row_f}</td>")
-                for j, val in enumerate(matrix[i]):
-                    color = "#ffffff"
-                    text_color = "#000000"
-                    # Simple color scale logic for HTML
-                    if val > 0:
-                        intensity = int(255 * (1 - abs(val)))
-                        color = f"rgb({intensity}, {intensity}, 255)"
-                    elif val < 0:
-                        intensity = int(255 * (1 - abs(val)))
-                        color = f"rgb(255, {intensity}, {intensity})"
-                    
-                    if abs(val) > 0.6: text_color = "#ffffff"
-                    
-                    html.append(f"<td class='heatmap-cell' style='background-color: {color}; color: {text_color}'>{val:.2f}</td>")
-                html.append("</tr>")
-            html.append("</tbody></table>")
-
-        html.append("</body></html>")
-        return "\n".join(html)
+                row_labels = labels[i] if labels else [f"{val:.2f}" for val in m[i].tolist()]
+                cells = "".join(f"{_HEATMAP_CELL_OPENINGS[k]}{label}</td>" for k, label in zip(opening_idx[i].tolist(), row_labels))
+                yield f"<tr><td class='stat-name'>{_esc(row_f)}</td>{cells}</tr>"
+            yield "</tbody></table>"
+
+        yield "</body></html>"